@@ -11,6 +11,7 @@ from .auth import AuthManager, CredentialStore
 from .config import get_paths, load_config
 from .memory import MemoryStore
 from .prompts import SystemPromptManager
+from .queue import TaskStore
 
 
 @dataclass
@@ -67,6 +68,13 @@ class ForgeApp:
             self._memory_store = MemoryStore(self.paths["memory_db"])
         return self._memory_store
 
+    def open_task_store(self) -> TaskStore:
+        """
+        Open a new task store for the configured database; callers close it.
+        """
+        network_mode = bool(self.config.get("runtime", {}).get("network_mode", False))
+        return TaskStore(self.paths["task_db"], network_mode=network_mode)
+
     def prompt_manager(self) -> SystemPromptManager:
         if self._prompt_manager is None:
             self._prompt_manager = SystemPromptManager()
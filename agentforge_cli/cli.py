@@ -26,9 +26,9 @@ from .config import (
 from .app import ForgeApp
 from .constants import DEFAULT_MODELS
 from .dashboard import run_dashboard
-from .logger import init_logging, write_system_log
+from .logger import init_logging, refresh_log_paths, write_system_log
 from .memory import default_memory_store
-from .queue import TaskStore, run_task_loop
+from .queue import run_task_loop
 from .scheduler import add_scheduled_task, parse_schedule_time, run_schedule_loop
 from . import get_version
 from .oauth.flow import perform_pkce_oauth
@@ -71,6 +71,7 @@ def _parse_provider_model(value: str, fallback_provider: Optional[str]) -> tuple
 @click.pass_context
 def cli(ctx: click.Context) -> None:
     """AgentForge CLI."""
+    refresh_log_paths()
     if ctx.obj is None or not isinstance(ctx.obj, ForgeApp):
         ctx.obj = ForgeApp.bootstrap()
 
@@ -81,7 +82,7 @@ def init(app: ForgeApp) -> None:
     """Initialise configuration, database, and log folders."""
     ensure_directories()
     ensure_env_file()
-    store = TaskStore(app.paths["task_db"])
+    store = app.open_task_store()
     store.close()
     app.refresh()
     click.echo("AgentForge workspace initialised:")
@@ -365,7 +366,7 @@ def add(
     priority: int,
 ) -> None:
     """Add a task to the queue."""
-    store = TaskStore(app.paths["task_db"])
+    store = app.open_task_store()
     try:
         task_id = store.add_task(
             task_description,
@@ -384,7 +385,7 @@ def add(
 @click.pass_obj
 def list(app: ForgeApp, limit: Optional[int]) -> None:  # type: ignore[override]
     """List tasks in the queue."""
-    store = TaskStore(app.paths["task_db"])
+    store = app.open_task_store()
     try:
         tasks = store.list_tasks(limit=limit)
     finally:
@@ -392,13 +393,13 @@ def list(app: ForgeApp, limit: Optional[int]) -> None:  # type: ignore[override]
     if not tasks:
         click.echo("No tasks in queue.")
         return
+    now = datetime.utcnow()
+    default_model = app.config.get("models", {}).get("agent", {}).get("name", app.config["agent_model"])
     for task in tasks:
-        available = task.available_at.isoformat()
-        now = datetime.utcnow()
-        delay_suffix = "" if task.available_at <= now else f" (delayed until {available})"
+        delay_suffix = "" if task.available_at <= now else f" (delayed until {task.available_at.isoformat()})"
         click.echo(
             f"#{task.id} [{task.status}] {task.description} "
-            f"(agent_model={task.agent_model or app.config.get('models', {}).get('agent', {}).get('name', app.config['agent_model'])}, "
+            f"(agent_model={task.agent_model or default_model}, "
             f"attempts={task.attempts}/{task.max_attempts}, priority={task.priority}){delay_suffix}"
         )
 
@@ -564,7 +565,7 @@ def monitor(app: ForgeApp, follow: bool, interval: float) -> None:
     """Display current queue statistics."""
 
     def print_stats() -> None:
-        store = TaskStore(app.paths["task_db"])
+        store = app.open_task_store()
         try:
             stats = store.stats()
         finally:
@@ -837,10 +838,13 @@ def plan_command(app: ForgeApp, output_dir: Optional[Path]) -> None:
         },
     ]
 
+    # plan.md and TODOs.yaml carry the same generation date
+    generated = datetime.utcnow().strftime("%Y-%m-%d")
     plan_md, todos = generate_plan(
         project_root,
         feature_specs,
-        output_dir=output_dir
+        output_dir=output_dir,
+        generated=generated,
     )
 
     click.echo(f"✓ Plan generated: {output_dir / 'plan.md'}")
@@ -850,7 +854,8 @@ def plan_command(app: ForgeApp, output_dir: Optional[Path]) -> None:
         todos,
         project_name="AgentForge",
         target_version="0.4.0",
-        output_file=output_dir / "TODOs.yaml"
+        output_file=output_dir / "TODOs.yaml",
+        generated=generated,
     )
 
     click.echo(f"✓ TODOs generated: {output_dir / 'TODOs.yaml'} ({len(todos)} items)")
@@ -4,12 +4,13 @@ Configuration helpers for AgentForge CLI.
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import textwrap
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
@@ -86,6 +87,10 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "runtime": {
         "default_concurrency": 10,
         "max_concurrency": 500,
+        # Set when the data directory lives on NFS/SMB: disables WAL for the task database.
+        "network_mode": False,
+        # Pause 0.5s + 0.2s inside each simulated task, e.g. to watch workers in the monitor.
+        "simulate_work": False,
         "autoscale": {
             "enabled": True,
             "scale_up_pending_per_worker": 2,
@@ -115,6 +120,26 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+# ((path, st_mtime_ns, st_size), parsed YAML) of the last config file read.
+_config_cache: Optional[Tuple[Tuple[Path, int, int], Dict[str, Any]]] = None
+
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
+    """Parse ``path``, reusing the previous parse while the file is unchanged.
+
+    Callers mutate the merged config, so each call gets its own deep copy.
+    """
+    global _config_cache
+    stat = path.stat()
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache
+    if cached is None or cached[0] != key:
+        with path.open("r", encoding="utf-8") as fh:
+            cached = (key, yaml.safe_load(fh) or {})
+        _config_cache = cached
+    return copy.deepcopy(cached[1])
+
+
 def ensure_directories() -> None:
     """Ensure the configuration directories exist."""
     constants.refresh_paths()
@@ -159,8 +184,7 @@ def load_config() -> Dict[str, Any]:
     """Load configuration or initialize defaults."""
     ensure_directories()
     if constants.CONFIG_FILE.exists():
-        with constants.CONFIG_FILE.open("r", encoding="utf-8") as fh:
-            data = yaml.safe_load(fh) or {}
+        data = _read_config_file(constants.CONFIG_FILE)
     else:
         data = DEFAULT_CONFIG.copy()
         save_config(data)
@@ -183,12 +207,13 @@ def load_config() -> Dict[str, Any]:
     merged["prompts"].setdefault("default_verification", prompts_default["default_verification"])
     merged["prompts"].setdefault("base", prompts_default["base"])
     return merged
-    return merged
 
 
 def save_config(config: Dict[str, Any]) -> None:
     """Persist configuration to disk."""
+    global _config_cache
     ensure_directories()
+    _config_cache = None
     with constants.CONFIG_FILE.open("w", encoding="utf-8") as fh:
         yaml.safe_dump(config, fh, sort_keys=True)
 
@@ -264,6 +289,8 @@ def get_runtime_settings() -> Dict[str, Any]:
     runtime = config.get("runtime", {}).copy()
     runtime.setdefault("default_concurrency", 10)
     runtime.setdefault("max_concurrency", 500)
+    runtime.setdefault("network_mode", False)
+    runtime.setdefault("simulate_work", False)
     autoscale = runtime.get("autoscale", {}).copy()
     autoscale.setdefault("enabled", True)
     autoscale.setdefault("scale_up_pending_per_worker", 2)
@@ -2,19 +2,58 @@
 
 from __future__ import annotations
 
-import html
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import atexit
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from threading import Thread
-from typing import Tuple
+from typing import List, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from . import constants
 from .config import load_config, set_active_model, set_agent_model
 from .logger import write_system_log
-from .queue import TaskStore
+from .queue import TaskStore, default_task_store
+
+DASHBOARD_WORKERS = 8
+
+# One TaskStore per request-handling thread, reused across requests.
+_store_tls = threading.local()
+_open_stores: List[TaskStore] = []
+_open_stores_lock = threading.Lock()
+
+
+def _get_store() -> TaskStore:
+    store = getattr(_store_tls, "store", None)
+    if store is not None and store.path == constants.TASK_DB:
+        return store
+    with _open_stores_lock:
+        if store is not None:
+            _open_stores.remove(store)
+            store.close()
+        store = default_task_store()
+        _open_stores.append(store)
+    _store_tls.store = store
+    return store
+
+
+def _close_stores() -> None:
+    with _open_stores_lock:
+        for store in _open_stores:
+            store.close()
+        _open_stores.clear()
+
+
+atexit.register(_close_stores)
 
 
 class DashboardHandler(BaseHTTPRequestHandler):
+    # Rendered homepage shared by all handlers: (monotonic timestamp, body).
+    _cache: Tuple[float, bytes] = (0.0, b"")
+    _TTL = 1.0
+
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
         if parsed.path == "/model" and parsed.query:
@@ -28,15 +67,18 @@ class DashboardHandler(BaseHTTPRequestHandler):
     def log_message(self, format: str, *args) -> None:  # noqa: A003
         write_system_log(format % args)
 
+    @classmethod
+    def _invalidate_cache(cls) -> None:
+        cls._cache = (0.0, b"")
+
     def _render_index(self) -> None:
-        config = load_config()
-        store = TaskStore(constants.TASK_DB)
-        try:
-            stats = store.stats()
-        finally:
-            store.close()
-        html_body = _render_homepage(config, stats)
-        body_bytes = html_body.encode("utf-8")
+        cached_at, body_bytes = DashboardHandler._cache
+        now = time.monotonic()
+        if not body_bytes or now - cached_at >= self._TTL:
+            config = load_config()
+            stats = _get_store().stats()
+            body_bytes = _render_homepage(config, stats).encode("utf-8")
+            DashboardHandler._cache = (now, body_bytes)
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(body_bytes)))
@@ -52,6 +94,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 write_system_log(f"Dashboard changed primary model to {provider}:{model}")
             except ValueError as exc:
                 write_system_log(f"Dashboard model update failed: {exc}", level="ERROR")
+        self._invalidate_cache()
         self.send_response(302)
         self.send_header("Location", "/")
         self.end_headers()
@@ -65,30 +108,64 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 write_system_log(f"Dashboard changed agent model to {provider}:{model}")
             except ValueError as exc:
                 write_system_log(f"Dashboard agent model update failed: {exc}", level="ERROR")
+        self._invalidate_cache()
         self.send_response(302)
         self.send_header("Location", "/")
         self.end_headers()
 
 
+# Same replacements as html.escape(quote=True), applied in a single C-level pass.
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+def _escape(text: str) -> str:
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+
+CatalogKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def _catalog_key(catalog) -> CatalogKey:
+    """Hashable snapshot of the model catalog used to memoise option HTML."""
+    return tuple((provider, tuple(models)) for provider, models in catalog.items())
+
+
+@lru_cache(maxsize=16)
+def _catalog_options(catalog_key: CatalogKey) -> Tuple[Tuple[str, str, str], ...]:
+    """(provider, model, escaped label) for every catalog entry, shared by both selectors."""
+    return tuple(
+        (provider, model, _escape(f"{provider}:{model}"))
+        for provider, models in catalog_key
+        for model in models
+    )
+
+
+@lru_cache(maxsize=64)
+def _options(catalog_key: CatalogKey, selected_provider: str, selected_model: str) -> str:
+    selected = (selected_provider, selected_model)
+    return "".join(
+        f"<option value='{label}'{' selected' if (provider, model) == selected else ''}>{label}</option>"
+        for provider, model, label in _catalog_options(catalog_key)
+    )
+
+
 def _render_homepage(config, stats) -> str:
     catalog = config.get("model_catalog", {})
     primary = config.get("models", {}).get("primary", {})
     agent_model = config.get("models", {}).get("agent", {})
     rows = "".join(
-        f"<tr><td>{html.escape(key)}</td><td>{value}</td></tr>" for key, value in stats.items()
+        f"<tr><td>{_escape(key)}</td><td>{value}</td></tr>" for key, value in stats.items()
     )
 
-    def _options(selected_provider: str, selected_model: str) -> str:
-        options = []
-        for provider, models in catalog.items():
-            for model in models:
-                selected = " selected" if provider == selected_provider and model == selected_model else ""
-                label = html.escape(f"{provider}:{model}")
-                options.append(f"<option value='{provider}:{model}'{selected}>{label}</option>")
-        return "".join(options)
-
-    primary_options = _options(primary.get("provider", ""), primary.get("name", ""))
-    agent_options = _options(agent_model.get("provider", ""), agent_model.get("name", ""))
+    catalog_key = _catalog_key(catalog)
+    primary_options = _options(catalog_key, primary.get("provider", ""), primary.get("name", ""))
+    agent_options = _options(catalog_key, agent_model.get("provider", ""), agent_model.get("name", ""))
 
     return f"""
     <html>
@@ -132,8 +209,32 @@ def _render_homepage(config, stats) -> str:
     """
 
 
-def run_dashboard(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
-    return ThreadingHTTPServer((host, port), DashboardHandler)
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that hands accepted connections to a fixed worker pool."""
+
+    def __init__(self, server_address: Tuple[str, int], handler_class, max_workers: int = DASHBOARD_WORKERS) -> None:
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AgentForgeDashboard")
+
+    def process_request(self, request, client_address) -> None:
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True)
+        _close_stores()
+
+
+def run_dashboard(host: str = "127.0.0.1", port: int = 8765) -> PooledHTTPServer:
+    return PooledHTTPServer((host, port), DashboardHandler)
 
 
 __all__ = ["run_dashboard"]
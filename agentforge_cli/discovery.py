@@ -6,12 +6,39 @@ Analyzes repository structure, components, dependencies, and gaps.
 
 from __future__ import annotations
 
+import ast
+import codecs
+import hashlib
 import json
+import os
+import tomllib
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import subprocess
 
 
+_READ_CHUNK_BYTES = 1 << 20
+
+# Latest (fingerprint, results) per project root; see _cached_discovery.
+_DISCOVERY_CACHE: Dict[str, Tuple[str, Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]] = {}
+
+_SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules"})
+
+_SUFFIX_KINDS = {
+    ".py": "python",
+    ".md": "documentation",
+    ".rst": "documentation",
+    ".txt": "documentation",
+    ".yaml": "config",
+    ".yml": "config",
+    ".toml": "config",
+    ".json": "config",
+    ".cfg": "config",
+    ".ini": "config",
+}
+
+
 def discover_codebase(project_root: Path) -> Dict[str, Any]:
     """
     Analyze repository structure and return comprehensive data.
@@ -33,40 +60,37 @@ def discover_codebase(project_root: Path) -> Dict[str, Any]:
         "total_lines": 0,
     }
 
-    # Find Python files
-    for py_file in project_root.rglob("*.py"):
-        if ".git" in str(py_file) or "__pycache__" in str(py_file):
-            continue
-
-        rel_path = py_file.relative_to(project_root)
-        file_info = {
-            "path": str(rel_path),
-            "lines": _count_lines(py_file),
-        }
-
-        if "test_" in py_file.name or str(rel_path).startswith("tests/"):
-            discovery["test_files"].append(file_info)
-        elif "cli" in str(rel_path):
-            discovery["cli_modules"].append(file_info)
-        else:
-            discovery["python_files"].append(file_info)
-
-        discovery["total_lines"] += file_info["lines"]
-        discovery["total_files"] += 1
-
-    # Find config files
-    for pattern in ["*.yaml", "*.yml", "*.toml", "*.json", "*.cfg", "*.ini"]:
-        for config_file in project_root.glob(pattern):
-            if ".git" in str(config_file):
+    # Single pass over the tree; pruned directories are never descended into.
+    root = os.fspath(project_root)
+    prefix_len = len(root.rstrip(os.sep)) + 1
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
+        dirnames[:] = [name for name in dirnames if name not in _SKIP_DIRS]
+        rel_dir = dirpath[prefix_len:]
+        for filename in filenames:
+            kind = _SUFFIX_KINDS.get(os.path.splitext(filename)[1])
+            if kind is None:
                 continue
-            discovery["config_files"].append(str(config_file.relative_to(project_root)))
-
-    # Find documentation
-    for pattern in ["*.md", "*.rst", "*.txt"]:
-        for doc_file in project_root.rglob(pattern):
-            if ".git" in str(doc_file) or "node_modules" in str(doc_file):
-                continue
-            discovery["documentation_files"].append(str(doc_file.relative_to(project_root)))
+            rel_path = os.path.join(rel_dir, filename) if rel_dir else filename
+
+            if kind == "python":
+                file_info = {
+                    "path": rel_path,
+                    "lines": _count_lines(os.path.join(dirpath, filename)),
+                }
+                if "test_" in filename or rel_path.startswith("tests/"):
+                    discovery["test_files"].append(file_info)
+                elif "cli" in rel_path:
+                    discovery["cli_modules"].append(file_info)
+                else:
+                    discovery["python_files"].append(file_info)
+
+                discovery["total_lines"] += file_info["lines"]
+                discovery["total_files"] += 1
+            elif kind == "documentation":
+                discovery["documentation_files"].append(rel_path)
+            elif kind == "config" and not rel_dir:
+                # Config files are only collected from the project root.
+                discovery["config_files"].append(rel_path)
 
     return discovery
 
@@ -122,33 +146,29 @@ def discover_dependencies(project_root: Path) -> Dict[str, Any]:
 
     # Parse pyproject.toml
     pyproject_file = project_root / "pyproject.toml"
-    if pyproject_file.exists():
-        content = pyproject_file.read_text()
-
-        # Extract Python version requirement
-        if 'requires-python' in content:
-            for line in content.split('\n'):
-                if 'requires-python' in line:
-                    dependencies["python_version"] = line.split('=')[1].strip().strip('"')
-                    break
-
-        # Extract dependencies
-        in_deps = False
-        for line in content.split('\n'):
-            if line.strip() == "dependencies = [":
-                in_deps = True
-                continue
-            if in_deps:
-                if ']' in line:
-                    break
-                if line.strip() and not line.strip().startswith('#'):
-                    dep = line.strip().strip('",')
-                    if dep:
-                        dependencies["packages"].append(dep)
+    key = _file_key(pyproject_file)
+    if key is not None:
+        python_version, packages = _parse_pyproject(*key)
+        dependencies["python_version"] = python_version
+        dependencies["packages"] = list(packages)
 
     return dependencies
 
 
+@lru_cache(maxsize=32)
+def _parse_pyproject(path: str, mtime_ns: int, size: int) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Parse pyproject.toml; cached per (path, mtime, size)."""
+    try:
+        data = tomllib.loads(Path(path).read_bytes().decode('utf-8'))
+    except (tomllib.TOMLDecodeError, UnicodeDecodeError):
+        return None, ()
+
+    project = data.get("project", {})
+    python_version = project.get("requires-python")
+    packages = project.get("dependencies", [])
+    return python_version, tuple(packages)
+
+
 def discover_missing(project_root: Path, requirements: List[str]) -> List[Dict[str, str]]:
     """
     Identify missing components vs requirements.
@@ -197,9 +217,7 @@ def generate_discovery_report(
     Returns:
         Markdown report as string
     """
-    codebase = discover_codebase(project_root)
-    components = discover_components(project_root)
-    dependencies = discover_dependencies(project_root)
+    codebase, components, dependencies = _cached_discovery(project_root)
 
     if requirements is None:
         requirements = ["/plan", "/resume", "/"]
@@ -338,69 +356,194 @@ def generate_discovery_report(
     return report
 
 
-def _count_lines(file_path: Path) -> int:
+def _count_lines(file_path: Union[str, Path]) -> int:
     """Count non-empty lines in a file."""
+    count = 0
+    tail = ""
+    # Same rules as iterating the file in text mode: UTF-8 with undecodable
+    # bytes dropped, \r, \n and \r\n all end a line, str.strip() decides
+    # blankness. The incremental decoder keeps characters split across chunks.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for line in f if line.strip())
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                # Blank lines are never counted, so "\r\n" splitting into two
+                # lines is harmless. Carry the partial last line over.
+                text = tail + decoder.decode(chunk).replace("\r", "\n")
+                head, _, tail = text.rpartition("\n")
+                count += sum(1 for line in head.split("\n") if line.strip())
+        tail += decoder.decode(b"", final=True)
     except Exception:
         return 0
+    if tail.strip():
+        count += 1
+    return count
 
 
 def _extract_cli_commands(cli_file: Path) -> List[str]:
     """Extract CLI command names from cli.py."""
-    commands = []
+    key = _file_key(cli_file)
+    if key is None:
+        return []
+    return list(_parse_cli_commands(*key))
+
+
+@lru_cache(maxsize=32)
+def _parse_cli_commands(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """Parse command names from a CLI module; cached per (path, mtime, size)."""
+    commands = set()
     try:
-        content = cli_file.read_text(encoding='utf-8')
-        for line in content.split('\n'):
-            # Look for @cli.command or @<group>.command
-            if '@' in line and '.command' in line:
-                # Extract command name
-                if 'name=' in line:
-                    # Extract from name="..." or name='...'
-                    parts = line.split('name=')[1]
-                    quote = parts[0]
-                    cmd_name = parts[1:].split(quote)[0]
-                    commands.append(cmd_name)
-                elif 'def ' in content[content.index(line):content.index(line) + 200]:
-                    # Get function name
-                    next_def = content[content.index(line):].split('def ')[1]
-                    func_name = next_def.split('(')[0].strip()
-                    commands.append(func_name)
+        tree = ast.parse(Path(path).read_text(encoding='utf-8'))
     except Exception:
-        pass
+        return ()
+
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            # Matches @<group>.command and @<group>.command(...)
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if not (isinstance(target, ast.Attribute) and target.attr == 'command'):
+                continue
+            commands.add(_command_name(decorator) or node.name)
 
-    return list(set(commands))  # Remove duplicates
+    return tuple(commands)
+
+
+def _command_name(decorator: ast.expr) -> Optional[str]:
+    """Return the explicit name given to a command decorator, if any."""
+    if not isinstance(decorator, ast.Call):
+        return None
+    candidates = list(decorator.args[:1])
+    candidates.extend(kw.value for kw in decorator.keywords if kw.arg == 'name')
+    for candidate in candidates:
+        if isinstance(candidate, ast.Constant) and isinstance(candidate.value, str):
+            return candidate.value
+    return None
+
+
+def _file_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    """Return a cache key identifying the current contents of ``path``."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _tree_fingerprint(project_root: Path) -> str:
+    """Hash the files discovery looks at.
+
+    Documentation files only contribute their names, since discovery never
+    reads them; this keeps a freshly written report from invalidating itself.
+    """
+    digest = hashlib.sha1()
+    root = os.fspath(project_root)
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
+        dirnames[:] = [name for name in dirnames if name not in _SKIP_DIRS]
+        dirnames.sort()
+        for filename in sorted(filenames):
+            kind = _SUFFIX_KINDS.get(os.path.splitext(filename)[1])
+            if kind is None:
+                continue
+            full_path = os.path.join(dirpath, filename)
+            if kind == "documentation":
+                digest.update(f"{full_path}\n".encode())
+                continue
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+            digest.update(f"{full_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _cached_discovery(project_root: Path) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Return codebase, components, and dependencies, reusing unchanged results."""
+    root_key = os.path.abspath(project_root)
+    fingerprint = _tree_fingerprint(project_root)
+    cached = _DISCOVERY_CACHE.get(root_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    result = (
+        discover_codebase(project_root),
+        discover_components(project_root),
+        discover_dependencies(project_root),
+    )
+    _DISCOVERY_CACHE[root_key] = (fingerprint, result)
+    return result
 
 
 def _get_git_info(project_root: Path) -> Optional[Dict[str, str]]:
     """Get git repository information."""
+    # Reading .git directly avoids spawning git at all in the common case.
+    info = _read_git_head(project_root)
+    if info is not None:
+        return info
+
     try:
-        # Get current branch
+        # One process: abbreviated commit hash, then ref names ("HEAD -> main, ...")
         result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+            ['git', 'log', '-1', '--format=%h%n%D', 'HEAD'],
             cwd=project_root,
             capture_output=True,
             text=True,
             timeout=5
         )
-        branch = result.stdout.strip() if result.returncode == 0 else None
+        if result.returncode != 0:
+            return {"branch": None, "commit": None}
 
-        # Get latest commit
-        result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        commit = result.stdout.strip() if result.returncode == 0 else None
+        commit, _, refs = result.stdout.strip().partition('\n')
+        branch = "HEAD"
+        if refs.startswith("HEAD -> "):
+            branch = refs[len("HEAD -> "):].split(',')[0].strip()
 
-        return {"branch": branch, "commit": commit}
+        return {"branch": branch, "commit": commit or None}
     except Exception:
         return None
 
 
+def _read_git_head(project_root: Path) -> Optional[Dict[str, str]]:
+    """Resolve branch and short commit from .git files; None if that is not possible."""
+    try:
+        git_dir = project_root / ".git"
+        if git_dir.is_file():
+            # Worktrees and submodules point at the real git dir.
+            pointer = git_dir.read_text(encoding='utf-8').strip()
+            if not pointer.startswith("gitdir:"):
+                return None
+            git_dir = project_root / pointer[len("gitdir:"):].strip()
+        head = (git_dir / "HEAD").read_text(encoding='utf-8').strip()
+        if head.startswith("ref: "):
+            ref = head[len("ref: "):]
+            branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+            commit = _resolve_git_ref(git_dir, ref)
+        else:
+            branch = "HEAD"
+            commit = head
+    except OSError:
+        return None
+    if not commit:
+        return None
+    return {"branch": branch, "commit": commit[:7]}
+
+
+def _resolve_git_ref(git_dir: Path, ref: str) -> Optional[str]:
+    loose = git_dir / ref
+    if loose.is_file():
+        return loose.read_text(encoding='utf-8').strip()
+    packed = git_dir / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text(encoding='utf-8').splitlines():
+            sha, _, name = line.partition(' ')
+            if name == ref:
+                return sha
+    return None
+
+
 def _get_timestamp() -> str:
     """Get current timestamp in ISO format."""
     from datetime import datetime
@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import time
 from pathlib import Path
 from typing import Optional
 
 from . import constants
 from .config import get_runtime_settings
+from .jsonio import dumps
 from .logger import write_system_log
-from .queue import TaskStore, run_task_loop
+from .queue import default_task_store, run_task_loop
 
 
 def run_load_test(agents: int, tasks: int, report_path: Path, reset: bool = False) -> dict:
@@ -19,12 +19,12 @@ def run_load_test(agents: int, tasks: int, report_path: Path, reset: bool = Fals
     if reset and constants.TASK_DB.exists():
         constants.TASK_DB.unlink()
 
-    store = TaskStore(constants.TASK_DB)
+    store = default_task_store()
     try:
-        existing = store.stats()["pending"] + store.stats()["running"]
+        stats = store.stats()
+        existing = stats["pending"] + stats["running"]
         remaining = max(0, tasks - existing)
-        for idx in range(remaining):
-            store.add_task(f"loadtest task {idx}")
+        store.add_tasks(f"loadtest task {idx}" for idx in range(remaining))
     finally:
         store.close()
 
@@ -34,7 +34,7 @@ def run_load_test(agents: int, tasks: int, report_path: Path, reset: bool = Fals
     run_task_loop(concurrency=concurrency, autoscale=True)
     duration = time.perf_counter() - start
 
-    store = TaskStore(constants.TASK_DB)
+    store = default_task_store()
     try:
         stats = store.stats()
     finally:
@@ -49,7 +49,7 @@ def run_load_test(agents: int, tasks: int, report_path: Path, reset: bool = Fals
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     }
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    report_path.write_bytes(dumps(report, indent=True))
     write_system_log(
         f"Load test completed: agents={agents}, tasks={tasks}, duration={duration:.2f}s",
         extra={"report": str(report_path)},
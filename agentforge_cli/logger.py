@@ -2,19 +2,46 @@
 
 from __future__ import annotations
 
-import json
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
 
 from . import constants
+from .jsonio import dumps
 
 MAX_LOG_BYTES = 1_000_000
 BACKUP_COUNT = 5
 
+# Append handles stay open for the life of the process; ``_handles_lock``
+# serialises writes, rotation, and teardown.
+_handles: Dict[Path, BinaryIO] = {}
+# Bytes in each open file, tracked on write so rotation needs no stat().
+_sizes: Dict[Path, int] = {}
+_known_dirs: Set[Path] = set()
+_handles_lock = threading.Lock()
+
+# Callers serialise payloads and enqueue them on a SimpleQueue (a C-level
+# append, no Condition to notify); a single daemon thread owns the file I/O
+# and writes up to ``WRITE_BATCH_SIZE`` lines between flushes. flush()
+# enqueues an Event that the writer sets once every earlier line is on disk.
+WRITE_BATCH_SIZE = 64
+_LogEntry = Union[Tuple[Path, bytes], threading.Event]
+_log_queue: "queue.SimpleQueue[_LogEntry]" = queue.SimpleQueue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_start_lock = threading.Lock()
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") reused by _utc_timestamp.
+_timestamp_prefix: Tuple[int, str] = (-1, "")
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -26,11 +53,44 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
-        return json.dumps(payload)
+        return dumps(payload).decode("utf-8")
 
 
-def init_logging() -> None:
+def flush() -> None:
+    """Block until every queued log line has been written to disk."""
+    if _writer_thread is None:
+        return  # nothing has been logged yet, so there is nothing to drain
+    _ensure_writer()
+    done = threading.Event()
+    _log_queue.put(done)
+    done.wait()
+
+
+def shutdown() -> None:
+    """Drain pending log lines and close the cached file handles."""
+    flush()
+    close_handles()
+
+
+def refresh_log_paths() -> None:
+    """Re-resolve log destinations from the current ``AGENTFORGE_HOME``.
+
+    The write helpers read the resolved paths from :mod:`constants` without
+    refreshing them. This neither flushes nor starts the writer thread, so it
+    is cheap enough to run once per CLI invocation.
+    """
     constants.refresh_paths()
+    _agent_log_path.cache_clear()
+
+
+def reconfigure() -> None:
+    """Drain and close open log files, then follow a changed ``AGENTFORGE_HOME``."""
+    shutdown()
+    refresh_log_paths()
+
+
+def init_logging() -> None:
+    reconfigure()
     constants.LOG_DIR.mkdir(parents=True, exist_ok=True)
     handler = logging.handlers.RotatingFileHandler(
         constants.SYSTEM_LOG_FILE,
@@ -45,15 +105,50 @@ def init_logging() -> None:
 
 
 def agent_log_path(agent_id: int) -> Path:
-    constants.refresh_paths()
-    return Path(str(constants.AGENT_LOG_TEMPLATE).format(agent_id=f"{agent_id:03d}"))
+    return _agent_log_path(constants.AGENT_LOG_TEMPLATE, agent_id)
 
 
-def _rotate_if_needed(path: Path) -> None:
-    if not path.exists():
-        return
-    if path.stat().st_size <= MAX_LOG_BYTES:
-        return
+@lru_cache(maxsize=1024)
+def _agent_log_path(template: Path, agent_id: int) -> Path:
+    # Keyed on the template too, so a refreshed AGENTFORGE_HOME never hits stale entries.
+    return Path(str(template).format(agent_id=f"{agent_id:03d}"))
+
+
+def _get_handle(path: Path) -> BinaryIO:
+    fh = _handles.get(path)
+    if fh is None:
+        parent = path.parent
+        if parent not in _known_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            _known_dirs.add(parent)
+        fh = path.open("ab")
+        _handles[path] = fh
+        _sizes[path] = os.fstat(fh.fileno()).st_size
+    return fh
+
+
+def _close_handle(path: Path) -> None:
+    _sizes.pop(path, None)
+    fh = _handles.pop(path, None)
+    if fh is not None:
+        fh.close()
+
+
+def close_handles() -> None:
+    """Close every cached log handle; the next write reopens as needed."""
+    with _handles_lock:
+        for fh in _handles.values():
+            fh.close()
+        _handles.clear()
+        _sizes.clear()
+        _known_dirs.clear()
+
+
+atexit.register(shutdown)
+
+
+def _rotate(path: Path) -> None:
+    _close_handle(path)
     for idx in range(BACKUP_COUNT, 0, -1):
         src = Path(f"{path}.{idx - 1}" if idx > 1 else str(path))
         dest = Path(f"{path}.{idx}")
@@ -63,15 +158,82 @@ def _rotate_if_needed(path: Path) -> None:
             os.replace(src, dest)
 
 
+def _write_line(path: Path, line: bytes) -> None:
+    fh = _get_handle(path)
+    if _sizes[path] > MAX_LOG_BYTES:
+        _rotate(path)
+        fh = _get_handle(path)
+    fh.write(line)
+    _sizes[path] += len(line)
+
+
+def _write_batch(batch: List[Tuple[Path, bytes]]) -> None:
+    touched: Set[Path] = set()
+    with _handles_lock:
+        for path, line in batch:
+            _write_line(path, line)
+            touched.add(path)
+        for path in touched:
+            fh = _handles.get(path)
+            if fh is not None:
+                fh.flush()
+
+
+def _writer_loop() -> None:
+    while True:
+        batch: List[Tuple[Path, bytes]] = []
+        markers: List[threading.Event] = []
+        entry = _log_queue.get()
+        while True:
+            if isinstance(entry, threading.Event):
+                markers.append(entry)
+            else:
+                batch.append(entry)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                break
+            try:
+                entry = _log_queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            _write_batch(batch)
+        except Exception as exc:  # pragma: no cover - keep the writer alive
+            print(f"AgentForge log writer error: {exc}", file=sys.stderr)
+        finally:
+            for marker in markers:
+                marker.set()
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    with _writer_start_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer_loop, name="AgentForgeLogWriter", daemon=True)
+            _writer_thread.start()
+
+
 def _append_json(path: Path, payload: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    _rotate_if_needed(path)
-    with path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(payload) + "\n")
+    line = dumps(payload) + b"\n"
+    _ensure_writer()
+    _log_queue.put_nowait((path, line))
+
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp; the date/time prefix is formatted once per second."""
+    global _timestamp_prefix
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_prefix
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_prefix = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}Z"
 
 
 def write_agent_log(agent_id: int, message: str, *, extra: Optional[Dict[str, Any]] = None) -> None:
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    timestamp = _utc_timestamp()
     payload: Dict[str, Any] = {
         "timestamp": timestamp,
         "agent_id": f"agent-{agent_id:03d}",
@@ -83,9 +245,8 @@ def write_agent_log(agent_id: int, message: str, *, extra: Optional[Dict[str, An
 
 
 def write_system_log(message: str, *, level: str = "INFO", extra: Optional[Dict[str, Any]] = None) -> None:
-    constants.refresh_paths()
     payload: Dict[str, Any] = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
         "level": level,
         "message": message,
     }
@@ -2,40 +2,153 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import math
+import operator
+import random
 import re
 import sqlite3
-from dataclasses import dataclass
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from . import constants
 
 
 _TOKEN_PATTERN = re.compile(r"\w+")
+_ASCII_TOKEN_PATTERN = re.compile(rb"\w+")
 _EMBEDDING_DIM = 128
+# _EMBEDDING_DIM is a power of two, so bucketing is a mask rather than a modulo.
+_EMBEDDING_MASK = _EMBEDDING_DIM - 1
+# Bumped whenever _bootstrap gains a data migration; stored in PRAGMA user_version.
+_SCHEMA_VERSION = 4
+
+# Random-hyperplane LSH: each embedding gets a 64-bit sign code, and searches
+# over large stores only score the rows whose codes are closest in Hamming
+# distance to the query's.
+_LSH_BITS = 64
+_LSH_SEED = 0x5EED
+_LSH_MASK = (1 << _LSH_BITS) - 1
+_LSH_CANDIDATES_PER_RESULT = 10
+# Below this many candidates, scoring them all is cheap and exact, and the
+# Hamming shortlist only costs recall, so it is skipped.
+_LSH_MIN_CANDIDATES = 5000
+
+# Scalar quantisation (SQ8): the search index holds each embedding as int8
+# codes scaled by 127, a quarter of the float32 footprint. The best
+# ``limit * _SQ8_RERANK_FACTOR`` rows are rescored exactly from float32.
+_SQ8_SCALE = 127
+_SQ8_RERANK_FACTOR = 4
+
+# Full-text prefilter: lexical matches are shortlisted through FTS5 (best bm25
+# rank first) before vector scoring, when there are enough of them.
+_FTS_CANDIDATES = 500
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to was with".split()
+)
+
+# Applied to every connection. Searches reread the whole table, so keep pages
+# hot in the cache and the mmap; WAL lets readers proceed during writes.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
 
 
 def _tokenize(text: str) -> Iterable[str]:
-    for match in _TOKEN_PATTERN.finditer(text.lower()):
-        yield match.group(0)
+    # Fold case per token rather than copying the whole text up front.
+    if text.islower():
+        return _TOKEN_PATTERN.findall(text)
+    return (token.lower() for token in _TOKEN_PATTERN.findall(text))
+
+
+def _token_buckets(text: str) -> List[int]:
+    """Embedding bucket of every token in ``text``.
+
+    Tokens are bucketed with CRC-32, which, unlike the builtin ``hash``, is not
+    salted per process, so stored embeddings stay comparable with new queries.
+    ASCII text is scanned as bytes, skipping a str-to-bytes copy per token.
+    """
+    if text.isascii():
+        tokens = _ASCII_TOKEN_PATTERN.findall(text.encode("ascii"))
+        if not text.islower():
+            tokens = [token.lower() for token in tokens]
+    else:
+        tokens = [token.encode("utf-8") for token in _tokenize(text)]
+    crc32 = zlib.crc32
+    return [crc32(token) & _EMBEDDING_MASK for token in tokens]
 
 
-def _vectorize(text: str) -> List[float]:
-    vector = [0.0] * _EMBEDDING_DIM
-    for token in _tokenize(text):
-        idx = hash(token) % _EMBEDDING_DIM
-        vector[idx] += 1.0
-    norm = math.sqrt(sum(value * value for value in vector))
-    if norm:
-        vector = [value / norm for value in vector]
-    return vector
+@lru_cache(maxsize=4096)
+def _vectorize(text: str) -> memoryview:
+    """Hashed bag-of-words embedding as a read-only view of L2-normalised float32s.
+
+    Results are shared between callers through the cache, hence read-only.
+    """
+    counts = Counter(_token_buckets(text))
+    vector = array("f", bytes(4 * _EMBEDDING_DIM))
+    if counts:
+        # Only the occupied buckets are touched; the rest stay zero.
+        scale = 1.0 / math.sqrt(sum(count * count for count in counts.values()))
+        for idx, count in counts.items():
+            vector[idx] = count * scale
+    return memoryview(vector).toreadonly()
 
 
 def _cosine_similarity(vec_a: Sequence[float], vec_b: Sequence[float]) -> float:
-    return sum(a * b for a, b in zip(vec_a, vec_b))
+    return sum(map(operator.mul, vec_a, vec_b))
+
+
+@lru_cache(maxsize=1)
+def _lsh_hyperplanes() -> Tuple[array, ...]:
+    rng = random.Random(_LSH_SEED)
+    return tuple(
+        array("f", [rng.gauss(0.0, 1.0) for _ in range(_EMBEDDING_DIM)]) for _ in range(_LSH_BITS)
+    )
+
+
+def _lsh_code(vector: Sequence[float]) -> int:
+    """Unsigned 64-bit code whose bit ``i`` is set when ``vector`` lies above hyperplane ``i``."""
+    code = 0
+    for bit, plane in enumerate(_lsh_hyperplanes()):
+        if sum(map(operator.mul, vector, plane)) > 0.0:
+            code |= 1 << bit
+    return code
+
+
+def _to_sqlite_int(code: int) -> int:
+    # SQLite integers are signed 64-bit; store the code's two's-complement value.
+    return code - (1 << _LSH_BITS) if code >> (_LSH_BITS - 1) else code
+
+
+def _quantize(vector: Sequence[float]) -> array:
+    return array("b", [max(-_SQ8_SCALE, min(_SQ8_SCALE, round(value * _SQ8_SCALE))) for value in vector])
+
+
+def _memory_row(
+    agent_id: str, content: str, metadata: Optional[Dict[str, object]], now: str
+) -> Tuple[object, ...]:
+    embedding = _vectorize(content)
+    return (
+        agent_id,
+        content,
+        json.dumps(metadata or {}),
+        embedding.tobytes(),
+        _quantize(embedding).tobytes(),
+        _to_sqlite_int(_lsh_code(embedding)),
+        now,
+        now,
+    )
 
 
 @dataclass
@@ -48,14 +161,45 @@ class MemoryRecord:
     similarity: float
 
 
+@dataclass
+class _EmbeddingIndex:
+    """Every stored embedding's SQ8 codes packed row-major into one contiguous int8 array."""
+
+    data_version: int
+    ids: List[int] = field(default_factory=list)
+    agent_ids: List[str] = field(default_factory=list)
+    codes: List[int] = field(default_factory=list)
+    positions: Dict[int, int] = field(default_factory=dict)
+    matrix: array = field(default_factory=lambda: array("b"))
+
+
 class MemoryStore:
     """Lightweight vector memory backed by SQLite."""
 
+    # Statements are kept as fixed strings so sqlite3's statement cache always
+    # hits; id lists are bound as one JSON array rather than N placeholders.
+    _INSERT_SQL = (
+        "INSERT INTO memories(agent_id, content, metadata, embedding, code_i8, code, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _INDEX_SQL = "SELECT id, agent_id, code_i8, code FROM memories ORDER BY id"
+    _FTS_SQL = "SELECT rowid FROM memories_fts WHERE memories_fts MATCH ? ORDER BY rank LIMIT ?"
+    _EMBEDDINGS_BY_ID_SQL = "SELECT id, embedding FROM memories WHERE id IN (SELECT value FROM json_each(?))"
+    _RECORDS_BY_ID_SQL = (
+        "SELECT id, agent_id, content, metadata, created_at FROM memories "
+        "WHERE id IN (SELECT value FROM json_each(?))"
+    )
+
     def __init__(self, path: Path) -> None:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(path)
         self.conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            self.conn.execute(pragma)
+        self._index: Optional[_EmbeddingIndex] = None
+        self._fts = False
+        self._in_transaction = False
         self._bootstrap()
 
     def __enter__(self) -> MemoryStore:
@@ -67,6 +211,25 @@ class MemoryStore:
     def close(self) -> None:
         self.conn.close()
 
+    @contextmanager
+    def transaction(self) -> Iterator[MemoryStore]:
+        """Group writes into a single commit.
+
+        ``add_memory`` calls made inside the block share one BEGIN/COMMIT, and
+        everything rolls back if the block raises. Nested blocks join the
+        outermost one.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._in_transaction = False
+            self._index = None
+
     def _bootstrap(self) -> None:
         self.conn.execute(
             """
@@ -75,7 +238,9 @@ class MemoryStore:
                 agent_id TEXT NOT NULL,
                 content TEXT NOT NULL,
                 metadata TEXT,
-                embedding TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                code_i8 BLOB,
+                code INTEGER,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL
             )
@@ -84,43 +249,216 @@ class MemoryStore:
         self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_memories_agent ON memories(agent_id)"
         )
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._migrate_json_embeddings()
+        if version < 2:
+            self._backfill_lsh_codes()
+        if version < 3:
+            self._reembed_all()
+        if version < 4:
+            self._backfill_sq8_codes()
+        if version < _SCHEMA_VERSION:
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._fts = self._ensure_fts()
         self.conn.commit()
 
+    def _ensure_fts(self) -> bool:
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories_fts'"
+        ).fetchone()
+        if exists is None:
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE memories_fts USING fts5("
+                    "content, content='memories', content_rowid='id', tokenize='porter unicode61')"
+                )
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; search scores every row instead.
+                return False
+            self.conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END
+            """
+        )
+        return True
+
+    def _migrate_json_embeddings(self) -> None:
+        # Older stores kept embeddings as JSON text; rewrite them as float32 BLOBs.
+        # The legacy column is declared TEXT, but SQLite never coerces BLOB values.
+        rows = self.conn.execute(
+            "SELECT id, embedding FROM memories WHERE typeof(embedding) = 'text'"
+        ).fetchall()
+        self.conn.executemany(
+            "UPDATE memories SET embedding = ? WHERE id = ?",
+            [(array("f", json.loads(row["embedding"])).tobytes(), row["id"]) for row in rows],
+        )
+
+    def _backfill_lsh_codes(self) -> None:
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(memories)")}
+        if "code" not in columns:
+            self.conn.execute("ALTER TABLE memories ADD COLUMN code INTEGER")
+        updates = []
+        for row in self.conn.execute("SELECT id, embedding FROM memories WHERE code IS NULL"):
+            vector = array("f")
+            vector.frombytes(row["embedding"])
+            updates.append((_to_sqlite_int(_lsh_code(vector)), row["id"]))
+        self.conn.executemany("UPDATE memories SET code = ? WHERE id = ?", updates)
+
+    def _reembed_all(self) -> None:
+        # Embeddings written before buckets used CRC-32 depended on the writing
+        # process's hash seed, so recompute them from the stored content.
+        updates = []
+        for row in self.conn.execute("SELECT id, content FROM memories"):
+            embedding = _vectorize(row["content"])
+            updates.append((embedding.tobytes(), _to_sqlite_int(_lsh_code(embedding)), row["id"]))
+        self.conn.executemany("UPDATE memories SET embedding = ?, code = ? WHERE id = ?", updates)
+
+    def _backfill_sq8_codes(self) -> None:
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(memories)")}
+        if "code_i8" not in columns:
+            self.conn.execute("ALTER TABLE memories ADD COLUMN code_i8 BLOB")
+        updates = []
+        for row in self.conn.execute("SELECT id, embedding FROM memories WHERE code_i8 IS NULL"):
+            updates.append((_quantize(memoryview(row["embedding"]).cast("f")).tobytes(), row["id"]))
+        self.conn.executemany("UPDATE memories SET code_i8 = ? WHERE id = ?", updates)
+
     def add_memory(self, agent_id: str, content: str, metadata: Optional[Dict[str, object]] = None) -> int:
-        embedding = _vectorize(content)
         now = datetime.utcnow().isoformat()
-        with self.conn:
-            cur = self.conn.execute(
-                """
-                INSERT INTO memories(agent_id, content, metadata, embedding, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    agent_id,
-                    content,
-                    json.dumps(metadata or {}),
-                    json.dumps(embedding),
-                    now,
-                    now,
-                ),
-            )
-            return cur.lastrowid
+        with self.transaction():
+            cur = self.conn.execute(self._INSERT_SQL, _memory_row(agent_id, content, metadata, now))
+        return cur.lastrowid
+
+    def add_memories(self, records: Iterable[Tuple[str, str, Optional[Dict[str, object]]]]) -> List[int]:
+        """Insert ``(agent_id, content, metadata)`` records in one transaction.
+
+        Returns the new row ids in input order.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [_memory_row(agent_id, content, metadata, now) for agent_id, content, metadata in records]
+        if not rows:
+            return []
+        with self.transaction():
+            self.conn.executemany(self._INSERT_SQL, rows)
+            # executemany leaves cursor.lastrowid unset; AUTOINCREMENT ids within
+            # one write transaction are contiguous, so count back from the last.
+            last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def _embedding_index(self) -> _EmbeddingIndex:
+        # PRAGMA data_version changes when another connection commits; our own
+        # writes drop the index explicitly.
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        index = self._index
+        if index is not None and index.data_version == data_version:
+            return index
+        index = _EmbeddingIndex(data_version)
+        blobs: List[bytes] = []
+        for row_id, row_agent, codes_i8, code in self.conn.execute(self._INDEX_SQL):
+            index.positions[row_id] = len(index.ids)
+            index.ids.append(row_id)
+            index.agent_ids.append(row_agent)
+            index.codes.append((code or 0) & _LSH_MASK)
+            blobs.append(codes_i8)
+        index.matrix.frombytes(b"".join(blobs))
+        self._index = index
+        return index
 
     def search(self, query: str, *, limit: int = 5, agent_id: Optional[str] = None) -> List[MemoryRecord]:
         query_vec = _vectorize(query)
         if not query_vec:
             return []
-        params: List[object] = []
-        sql = "SELECT id, agent_id, content, metadata, embedding, created_at FROM memories"
-        if agent_id:
-            sql += " WHERE agent_id = ?"
-            params.append(agent_id)
-        rows = self.conn.execute(sql, params).fetchall()
-        scored: List[MemoryRecord] = []
-        for row in rows:
-            embedding = json.loads(row["embedding"])
-            similarity = _cosine_similarity(query_vec, embedding)
-            scored.append(
+        index = self._embedding_index()
+        matrix = memoryview(index.matrix)
+        positions = self._text_matches(index, query, limit=limit, agent_id=agent_id)
+        if positions is None:
+            if agent_id:
+                positions = [pos for pos, owner in enumerate(index.agent_ids) if owner == agent_id]
+            else:
+                positions = list(range(len(index.ids)))
+        shortlist = _LSH_CANDIDATES_PER_RESULT * limit
+        if len(positions) > max(shortlist, _LSH_MIN_CANDIDATES):
+            query_code = _lsh_code(query_vec)
+            codes = index.codes
+            nearest = heapq.nsmallest(shortlist, positions, key=lambda pos: (codes[pos] ^ query_code).bit_count())
+            positions = sorted(nearest)
+        query_codes = _quantize(query_vec)
+        coarse: List[Tuple[int, int]] = []
+        for pos in positions:
+            start = pos * _EMBEDDING_DIM
+            coarse.append((_cosine_similarity(query_codes, matrix[start : start + _EMBEDDING_DIM]), pos))
+        # nlargest keeps a heap of the best entries instead of sorting every row;
+        # like sorted(), it keeps insertion order between equal scores.
+        rerank = heapq.nlargest(limit * _SQ8_RERANK_FACTOR, coarse, key=operator.itemgetter(0))
+        ids = sorted(index.ids[pos] for _, pos in rerank)
+        return self._records(heapq.nlargest(limit, self._exact_scores(query_vec, ids), key=operator.itemgetter(0)))
+
+    def _exact_scores(self, query_vec: Sequence[float], ids: Sequence[int]) -> List[Tuple[float, int]]:
+        """Float32 similarities for ``ids``, in the order given."""
+        if not ids:
+            return []
+        blobs = dict(self.conn.execute(self._EMBEDDINGS_BY_ID_SQL, (json.dumps(ids),)).fetchall())
+        return [
+            (_cosine_similarity(query_vec, memoryview(blobs[row_id]).cast("f")), row_id)
+            for row_id in ids
+            if row_id in blobs
+        ]
+
+    def _text_matches(
+        self, index: _EmbeddingIndex, query: str, *, limit: int, agent_id: Optional[str]
+    ) -> Optional[List[int]]:
+        """Index positions of rows sharing a term with ``query``, or None to scan everything.
+
+        Falls back to a full scan when fewer than ``limit`` rows match, so the
+        result still fills up with the nearest non-lexical neighbours.
+        """
+        if not self._fts:
+            return None
+        terms = {token for token in _TOKEN_PATTERN.findall(query.lower()) if token not in _STOPWORDS}
+        if not terms:
+            return None
+        match = " OR ".join(f'"{term}"' for term in sorted(terms))
+        rows = self.conn.execute(self._FTS_SQL, (match, _FTS_CANDIDATES))
+        positions = []
+        for (row_id,) in rows:
+            pos = index.positions.get(row_id)
+            if pos is not None and (not agent_id or index.agent_ids[pos] == agent_id):
+                positions.append(pos)
+        if len(positions) < limit:
+            return None
+        positions.sort()
+        return positions
+
+    def _records(self, scored: Sequence[Tuple[float, int]]) -> List[MemoryRecord]:
+        """Hydrate ``(similarity, id)`` pairs into records, preserving their order."""
+        if not scored:
+            return []
+        ids = json.dumps([row_id for _, row_id in scored])
+        rows = {row["id"]: row for row in self.conn.execute(self._RECORDS_BY_ID_SQL, (ids,))}
+        records: List[MemoryRecord] = []
+        for similarity, row_id in scored:
+            row = rows.get(row_id)
+            if row is None:
+                continue
+            records.append(
                 MemoryRecord(
                     id=row["id"],
                     agent_id=row["agent_id"],
@@ -130,8 +468,7 @@ class MemoryStore:
                     similarity=similarity,
                 )
             )
-        scored.sort(key=lambda record: record.similarity, reverse=True)
-        return scored[:limit]
+        return records
 
 
 def default_memory_store() -> MemoryStore:
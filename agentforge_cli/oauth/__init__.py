@@ -1,10 +1,11 @@
 """OAuth helpers for AgentForge."""
 
-from .listener import OAuthRedirectServer, find_open_port, run_listener, validate_redirect_uri
+from .listener import OAuthRedirectServer, find_open_port, find_open_socket, run_listener, validate_redirect_uri
 
 __all__ = [
     "OAuthRedirectServer",
     "find_open_port",
+    "find_open_socket",
     "run_listener",
     "validate_redirect_uri",
 ]
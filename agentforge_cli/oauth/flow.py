@@ -9,7 +9,7 @@ from urllib.parse import urlencode, urlparse
 
 import requests
 
-from .listener import OAuthRedirectServer, find_open_port, run_listener, validate_redirect_uri
+from .listener import OAuthRedirectServer, find_open_socket, run_listener, validate_redirect_uri
 from .pkce import generate_code_challenge, generate_code_verifier
 
 
@@ -38,14 +38,17 @@ def perform_pkce_oauth(
     redirect = redirect_uri
     local_listener = False
     if redirect is None:
-        port = find_open_port()
-        redirect = f"http://127.0.0.1:{port}/callback"
+        redirect = "http://127.0.0.1/callback"
     parsed_redirect = urlparse(redirect)
     if parsed_redirect.hostname in {"127.0.0.1", "localhost"}:
         validate_redirect_uri(redirect)
-        port = parsed_redirect.port or find_open_port()
         path = parsed_redirect.path or "/callback"
-        listener = OAuthRedirectServer(port, state, [path])
+        if parsed_redirect.port:
+            listener = OAuthRedirectServer(parsed_redirect.port, state, [path])
+        else:
+            # Keep the probed socket bound so no other process can take the port.
+            listener = OAuthRedirectServer.from_socket(find_open_socket(), state, [path])
+        port = listener.server_port
         redirect = f"http://127.0.0.1:{port}{path}"
         local_listener = manual_code is None
 
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import threading
+import time
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from socket import socket
-from typing import Dict, Iterable, Optional
+from socket import SO_REUSEADDR, SOL_SOCKET, socket
+from typing import Dict, Iterable, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 
@@ -55,48 +56,101 @@ class _OAuthHandler(BaseHTTPRequestHandler):
         self.send_response(status)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(payload)))
+        # One response per connection, so handle_request() never waits on keep-alive.
+        self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(payload)
 
 
 class OAuthRedirectServer(HTTPServer):
-    """HTTP server that captures a single OAuth redirect and records query parameters."""
-
-    def __init__(self, port: int, expected_state: str, allowed_paths: Iterable[str]) -> None:
-        super().__init__(("127.0.0.1", port), _OAuthHandler)
+    """HTTP server that captures a single OAuth redirect and records query parameters.
+
+    ``sock``, when given, is a socket already bound to ``port`` by
+    :func:`find_open_socket`; the server adopts it instead of binding again.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        expected_state: str,
+        allowed_paths: Iterable[str],
+        *,
+        sock: Optional[socket] = None,
+    ) -> None:
+        if sock is None:
+            super().__init__(("127.0.0.1", port), _OAuthHandler)
+        else:
+            bound_port = sock.getsockname()[1]
+            if bound_port != port:
+                raise ValueError(f"Socket is bound to port {bound_port}, not {port}")
+            super().__init__(sock.getsockname(), _OAuthHandler, bind_and_activate=False)
+            self.socket.close()
+            self.socket = sock
+            self.server_name, self.server_port = self.server_address[:2]
+            try:
+                self.server_activate()
+            except BaseException:
+                self.server_close()
+                raise
         self.expected_state = expected_state
         self.allowed_paths = tuple(allowed_paths)
         self.event = threading.Event()
         self.result: Optional[Dict[str, str]] = None
         self.error: Optional[Exception] = None
 
+    def get_request(self) -> Tuple[socket, Tuple[str, int]]:
+        conn, addr = super().get_request()
+        # handle_request() runs on the caller's thread, so a client that
+        # connects and sends nothing must not outlive run_listener's deadline.
+        conn.settimeout(self.timeout)
+        return conn, addr
 
-def find_open_port(start: int = 8765, end: int = 9999) -> int:
+    @classmethod
+    def from_socket(cls, sock: socket, expected_state: str, allowed_paths: Iterable[str]) -> OAuthRedirectServer:
+        """Build a server on ``sock``, a socket returned by :func:`find_open_socket`."""
+        return cls(sock.getsockname()[1], expected_state, allowed_paths, sock=sock)
+
+
+def find_open_socket(start: int = 8765, end: int = 9999) -> socket:
+    """Return a socket bound to the first free localhost port in ``[start, end]``.
+
+    Handing the bound socket to :class:`OAuthRedirectServer` avoids the race
+    between probing a port and binding it again.
+    """
     for port in range(start, end + 1):
-        with socket() as sock:
-            try:
-                sock.bind(("127.0.0.1", port))
-                return port
-            except OSError:
-                continue
+        sock = socket()
+        sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            sock.close()
+            continue
+        return sock
     raise RuntimeError("No open localhost ports available for OAuth listener")
 
 
+def find_open_port(start: int = 8765, end: int = 9999) -> int:
+    with find_open_socket(start, end) as sock:
+        return sock.getsockname()[1]
+
+
 def run_listener(server: OAuthRedirectServer, timeout: float = 120.0) -> Dict[str, str]:
-    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.2}, daemon=True)
-    thread.start()
+    """Serve requests on the calling thread until the redirect arrives or ``timeout`` expires."""
+    deadline = time.monotonic() + timeout
     try:
-        if not server.event.wait(timeout):
-            raise TimeoutError("Timed out waiting for OAuth redirect")
+        while not server.event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for OAuth redirect")
+            server.timeout = min(remaining, 5.0)
+            server.handle_request()
         if server.error:
             raise server.error
         if not server.result:
             raise RuntimeError("OAuth redirect did not return parameters")
         return server.result
     finally:
-        server.shutdown()
         server.server_close()
-        thread.join()
 
 
-__all__ = ["validate_redirect_uri", "OAuthRedirectServer", "find_open_port", "run_listener"]
+__all__ = ["validate_redirect_uri", "OAuthRedirectServer", "find_open_port", "find_open_socket", "run_listener"]
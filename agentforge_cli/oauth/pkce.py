@@ -5,20 +5,20 @@ from __future__ import annotations
 import base64
 import hashlib
 import secrets
-import string
+from typing import Union
 
 
 def generate_code_verifier(length: int = 64) -> str:
     if length < 43 or length > 128:
         raise ValueError("PKCE code verifier length must be between 43 and 128")
-    alphabet = string.ascii_letters + string.digits + "-._~"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    # URL-safe base64 only uses [A-Za-z0-9_-], a subset of the RFC 7636 unreserved set.
+    return secrets.token_urlsafe(length * 3 // 4 + 1)[:length]
 
 
-def generate_code_challenge(verifier: str) -> str:
-    digest = hashlib.sha256(verifier.encode("utf-8")).digest()
-    challenge = base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
-    return challenge
+def generate_code_challenge(verifier: Union[str, bytes]) -> str:
+    data = verifier if isinstance(verifier, bytes) else verifier.encode("utf-8")
+    # Strip padding on the bytes so only the final challenge is decoded to str.
+    return base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode("ascii")
 
 
 __all__ = ["generate_code_verifier", "generate_code_challenge"]
@@ -6,20 +6,65 @@ Interactive command browser with search and selection.
 
 from __future__ import annotations
 
+import weakref
+from collections import defaultdict
+
 import click
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class CommandCatalog(list):
+    """Command list with a trigram index over lowercased names and help text.
+
+    ``trigrams`` maps each three-character substring to the positions of the
+    commands containing it, letting filter_commands skip non-candidates.
+    """
+
+    def __init__(self, commands: List[Dict[str, Any]]) -> None:
+        super().__init__(commands)
+        self.trigrams: Dict[str, Set[int]] = {}
+        for pos, cmd in enumerate(self):
+            for text in (cmd["name_lower"], cmd["help_lower"]):
+                for start in range(len(text) - 2):
+                    self.trigrams.setdefault(text[start:start + 3], set()).add(pos)
 
+    def candidates(self, query_lower: str) -> List[int]:
+        """Positions of commands containing every trigram of a 3+ character query."""
+        grams = {query_lower[start:start + 3] for start in range(len(query_lower) - 2)}
+        postings = sorted((self.trigrams.get(gram, set()) for gram in grams), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches &= posting
+        return sorted(matches)
 
-def build_command_catalog(cli_group: click.Group) -> List[Dict[str, Any]]:
+
+# Catalogs per CLI group; the command tree is fixed once the CLI is imported.
+_CATALOG_CACHE: "weakref.WeakKeyDictionary[click.Group, CommandCatalog]" = weakref.WeakKeyDictionary()
+
+
+def build_command_catalog(cli_group: click.Group) -> CommandCatalog:
     """
     Build catalog of all CLI commands.
 
+    The catalog is built once per group and shared by later calls, so callers
+    must not mutate it.
+
     Args:
         cli_group: Click CLI group
 
     Returns:
         List of command metadata dictionaries
     """
+    catalog = _CATALOG_CACHE.get(cli_group)
+    if catalog is None:
+        catalog = _build_command_catalog(cli_group)
+        _CATALOG_CACHE[cli_group] = catalog
+    return catalog
+
+
+def _build_command_catalog(cli_group: click.Group) -> CommandCatalog:
     commands = []
 
     def extract_commands(group: click.Group, prefix: str = ""):
@@ -32,16 +77,69 @@ def build_command_catalog(cli_group: click.Group) -> List[Dict[str, Any]]:
                 extract_commands(cmd, prefix=f"{full_name} ")
             else:
                 # Regular command
-                commands.append({
+                help_text = cmd.help or "No description available"
+                entry = {
                     "name": full_name,
-                    "help": cmd.help or "No description available",
+                    "help": help_text,
                     "short_help": cmd.short_help or cmd.help or "",
                     "params": [p.name for p in cmd.params if not getattr(p, 'hidden', False)],
-                })
+                    # Lowercased once so filtering doesn't redo it per keystroke
+                    "name_lower": full_name.lower(),
+                    "help_lower": help_text.lower(),
+                }
+                # Same for the rendered line that highlight_matches searches
+                entry["display"] = format_command_display(entry)
+                entry["display_lower"] = entry["display"].lower()
+                commands.append(entry)
 
     extract_commands(cli_group)
 
-    return sorted(commands, key=lambda x: x["name"])
+    return CommandCatalog(sorted(commands, key=lambda x: x["name"]))
+
+
+# Display order of palette categories
+_CATEGORY_ORDER = ("Core", "Auth", "Model", "Queue", "Agent", "Schedule", "Memory", "Monitor", "Verify", "Other")
+
+# Whole command names with a fixed category
+_EXACT_CATEGORIES = {
+    "/model": "Model",
+    "/agentmodel": "Model",
+    "status": "Monitor",
+    "dashboard": "Monitor",
+    "init": "Core",
+    "plan": "Core",
+    "resume": "Core",
+    "/plan": "Core",
+    "/resume": "Core",
+    "/login": "Core",
+    "/new": "Core",
+}
+
+# Name prefixes, checked in order; no prefix is a prefix of another
+_PREFIX_CATEGORIES = {
+    "auth": "Auth",
+    "model": "Model",
+    "queue": "Queue",
+    "agent": "Agent",
+    "schedule": "Schedule",
+    "memory": "Memory",
+    "monitor": "Monitor",
+    "verify": "Verify",
+}
+
+
+def _categorize(name: str) -> str:
+    category = _EXACT_CATEGORIES.get(name)
+    if category is not None:
+        return category
+    # Group names are the common case: one lookup on the first word
+    category = _PREFIX_CATEGORIES.get(name.split(" ", 1)[0])
+    if category is not None:
+        return category
+    for prefix, category in _PREFIX_CATEGORIES.items():
+        if name.startswith(prefix):
+            return category
+    return "Other"
 
 
 def group_commands(commands: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -54,46 +152,13 @@ def group_commands(commands: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, A
     Returns:
         Dictionary mapping category to commands
     """
-    groups = {
-        "Core": [],
-        "Auth": [],
-        "Model": [],
-        "Queue": [],
-        "Agent": [],
-        "Schedule": [],
-        "Memory": [],
-        "Monitor": [],
-        "Verify": [],
-        "Other": [],
-    }
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
     for cmd in commands:
-        name = cmd["name"]
-
-        # Categorize
-        if name.startswith("auth"):
-            groups["Auth"].append(cmd)
-        elif name.startswith("model") or name in ["/model", "/agentmodel"]:
-            groups["Model"].append(cmd)
-        elif name.startswith("queue"):
-            groups["Queue"].append(cmd)
-        elif name.startswith("agent"):
-            groups["Agent"].append(cmd)
-        elif name.startswith("schedule"):
-            groups["Schedule"].append(cmd)
-        elif name.startswith("memory"):
-            groups["Memory"].append(cmd)
-        elif name.startswith("monitor") or name == "status" or name == "dashboard":
-            groups["Monitor"].append(cmd)
-        elif name.startswith("verify"):
-            groups["Verify"].append(cmd)
-        elif name in ["init", "plan", "resume", "/plan", "/resume", "/login", "/new"]:
-            groups["Core"].append(cmd)
-        else:
-            groups["Other"].append(cmd)
-
-    # Remove empty groups
-    return {k: v for k, v in groups.items() if v}
+        groups[_categorize(cmd["name"])].append(cmd)
+
+    # Only non-empty categories, in display order
+    return {category: groups[category] for category in _CATEGORY_ORDER if category in groups}
 
 
 def filter_commands(query: str, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -113,27 +178,43 @@ def filter_commands(query: str, commands: List[Dict[str, Any]]) -> List[Dict[str
     query_lower = query.lower()
     filtered = []
 
+    if isinstance(commands, CommandCatalog) and len(query_lower) >= 3:
+        # Trigram hits are candidates only; the substring checks below confirm them
+        commands = [commands[pos] for pos in commands.candidates(query_lower)]
+
     for cmd in commands:
+        # Catalog entries carry lowercased copies; plain dicts fall back to lower()
+        name_lower = cmd.get("name_lower") or cmd["name"].lower()
+        help_lower = cmd.get("help_lower") or cmd["help"].lower()
+
         # Check name match
-        if query_lower in cmd["name"].lower():
+        if query_lower in name_lower:
             filtered.append(cmd)
             continue
 
         # Check description match
-        if query_lower in cmd["help"].lower():
+        if query_lower in help_lower:
             filtered.append(cmd)
             continue
 
     return filtered
 
 
-def highlight_matches(query: str, text: str) -> str:
+def highlight_matches(
+    query: str,
+    text: str,
+    *,
+    query_lower: Optional[str] = None,
+    text_lower: Optional[str] = None,
+) -> str:
     """
     Highlight query matches in text.
 
     Args:
         query: Search query
         text: Text to highlight
+        query_lower: Precomputed ``query.lower()``
+        text_lower: Precomputed ``text.lower()``
 
     Returns:
         Text with highlighted matches
@@ -143,18 +224,29 @@ def highlight_matches(query: str, text: str) -> str:
 
     # Simple case-insensitive highlight
     # In a real terminal UI, this would use ANSI codes
-    query_lower = query.lower()
-    text_lower = text.lower()
-
-    if query_lower in text_lower:
-        idx = text_lower.index(query_lower)
-        return (
-            text[:idx] +
-            f"[{text[idx:idx + len(query)]}]" +
-            text[idx + len(query):]
-        )
+    if query_lower is None:
+        query_lower = query.lower()
+    if text_lower is None:
+        text_lower = text.lower()
+
+    idx = text_lower.find(query_lower)
+    if idx < 0:
+        return text
+
+    return (
+        text[:idx] +
+        f"[{text[idx:idx + len(query)]}]" +
+        text[idx + len(query):]
+    )
 
-    return text
+
+def _display_line(cmd: Dict[str, Any]) -> Tuple[str, str]:
+    """Default-width display line and its lowercase, precomputed for catalog entries."""
+    display = cmd.get("display")
+    if display is None:
+        display = format_command_display(cmd)
+        return display, display.lower()
+    return display, cmd["display_lower"]
 
 
 def format_command_display(cmd: Dict[str, Any], width: int = 80) -> str:
@@ -192,21 +284,29 @@ def display_palette(
         grouped: Whether to group by category
         search_query: Current search query
     """
+    query_lower = search_query.lower()
+
     if grouped:
         groups = group_commands(commands)
 
         for category, cmds in groups.items():
             click.echo(f"\n{category}:")
             for cmd in cmds:
-                display_text = format_command_display(cmd)
+                display_text, display_lower = _display_line(cmd)
                 if search_query:
-                    display_text = highlight_matches(search_query, display_text)
+                    display_text = highlight_matches(
+                        search_query, display_text, query_lower=query_lower, text_lower=display_lower
+                    )
                 click.echo(display_text)
     else:
         for idx, cmd in enumerate(commands, 1):
-            display_text = f"{idx}. {format_command_display(cmd)}"
+            display_text, display_lower = _display_line(cmd)
+            prefix = f"{idx}. "
+            display_text = prefix + display_text
             if search_query:
-                display_text = highlight_matches(search_query, display_text)
+                display_text = highlight_matches(
+                    search_query, display_text, query_lower=query_lower, text_lower=prefix + display_lower
+                )
             click.echo(display_text)
 
 
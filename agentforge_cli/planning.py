@@ -6,12 +6,21 @@ Generates execution plans, TODOs, and manages dependencies.
 
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+import io
+import re
+from collections import Counter
+from itertools import count, groupby
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 import yaml
 
+try:  # libyaml-backed emitter; output is identical, just much faster
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
 
 class TodoGenerator:
     """Generates TODO items from plans."""
@@ -104,12 +113,17 @@ def generate_todos_for_feature(
     return todos
 
 
-def order_by_dependencies(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def order_by_dependencies(
+    todos: List[Dict[str, Any]],
+    *,
+    todo_map: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
     """
     Sort TODOs by dependency order using topological sort.
 
     Args:
         todos: List of TODO dictionaries
+        todo_map: Optional prebuilt {id: todo} index of todos
 
     Returns:
         Sorted list of TODOs
@@ -117,37 +131,40 @@ def order_by_dependencies(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Raises:
         ValueError: If circular dependencies detected
     """
-    # Build dependency graph
-    graph = defaultdict(list)
-    in_degree = defaultdict(int)
-    todo_map = {todo["id"]: todo for todo in todos}
+    todo_map = todo_map or {todo["id"]: todo for todo in todos}
+    # Common case: nothing depends on anything, so the order is just priority.
+    # The stable sort keeps first-seen order for ties, exactly as the heap does.
+    if len(todo_map) == len(todos) and not any(todo.get("dependencies") for todo in todos):
+        return sorted(todo_map.values(), key=lambda todo: todo.get("priority", 999))
 
-    # Initialize in_degree for all nodes
-    for todo in todos:
-        if todo["id"] not in in_degree:
-            in_degree[todo["id"]] = 0
+    # Build dependency graph
+    graph: Dict[str, List[str]] = {}
+    in_degree = dict.fromkeys(todo_map, 0)
+    # Heap keys read priorities from here rather than calling .get per push
+    pri = {todo_id: todo.get("priority", 999) for todo_id, todo in todo_map.items()}
 
     # Build graph
     for todo in todos:
         for dep in todo.get("dependencies", []):
             if dep in todo_map:
-                graph[dep].append(todo["id"])
+                graph.setdefault(dep, []).append(todo["id"])
                 in_degree[todo["id"]] += 1
 
-    # Topological sort using Kahn's algorithm
-    queue = [todo_id for todo_id in todo_map.keys() if in_degree[todo_id] == 0]
+    # Topological sort using Kahn's algorithm over a (priority, arrival) heap;
+    # the arrival counter keeps equal priorities in first-ready order
+    arrival = count()
+    heap = [(pri[todo_id], next(arrival), todo_id) for todo_id, degree in in_degree.items() if degree == 0]
+    heapq.heapify(heap)
     sorted_ids = []
 
-    while queue:
-        # Sort queue by priority for stable ordering
-        queue.sort(key=lambda x: todo_map[x].get("priority", 999))
-        current = queue.pop(0)
+    while heap:
+        _, _, current = heapq.heappop(heap)
         sorted_ids.append(current)
 
-        for neighbor in graph[current]:
+        for neighbor in graph.get(current, ()):
             in_degree[neighbor] -= 1
             if in_degree[neighbor] == 0:
-                queue.append(neighbor)
+                heapq.heappush(heap, (pri[neighbor], next(arrival), neighbor))
 
     # Check for cycles
     if len(sorted_ids) != len(todos):
@@ -157,98 +174,145 @@ def order_by_dependencies(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [todo_map[todo_id] for todo_id in sorted_ids]
 
 
-def detect_cycles(todos: List[Dict[str, Any]]) -> Optional[List[str]]:
+def detect_cycles(
+    todos: List[Dict[str, Any]],
+    *,
+    todo_map: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Optional[List[str]]:
     """
     Detect cycles in TODO dependencies.
 
     Args:
         todos: List of TODO dictionaries
+        todo_map: Optional prebuilt {id: todo} index of todos
 
     Returns:
         List of TODO IDs in cycle, or None if no cycle
     """
-    todo_map = {todo["id"]: todo for todo in todos}
+    todo_map = todo_map or {todo["id"]: todo for todo in todos}
     visited = set()
-    rec_stack = set()
-
-    def visit(todo_id: str, path: List[str]) -> Optional[List[str]]:
-        if todo_id in rec_stack:
-            # Found cycle
-            cycle_start = path.index(todo_id)
-            return path[cycle_start:]
-
-        if todo_id in visited:
-            return None
-
-        visited.add(todo_id)
-        rec_stack.add(todo_id)
-
-        todo = todo_map.get(todo_id)
-        if todo:
-            for dep in todo.get("dependencies", []):
-                if dep in todo_map:
-                    result = visit(dep, path + [todo_id])
-                    if result:
-                        return result
-
-        rec_stack.remove(todo_id)
-        return None
 
     for todo in todos:
-        if todo["id"] not in visited:
-            cycle = visit(todo["id"], [])
-            if cycle:
-                return cycle
+        root = todo["id"]
+        if root in visited:
+            continue
+
+        # Iterative DFS; the stack is the current path and on_path maps each
+        # node on it to its stack position, so a back edge slices the cycle out
+        visited.add(root)
+        stack = [(root, iter(todo_map[root].get("dependencies", [])))]
+        on_path = {root: 0}
+        while stack:
+            todo_id, deps = stack[-1]
+            for dep in deps:
+                if dep not in todo_map:
+                    continue
+                if dep in on_path:
+                    # Found cycle
+                    return [node for node, _ in stack[on_path[dep]:]]
+                if dep not in visited:
+                    visited.add(dep)
+                    on_path[dep] = len(stack)
+                    stack.append((dep, iter(todo_map[dep].get("dependencies", []))))
+                    break
+            else:
+                stack.pop()
+                del on_path[todo_id]
 
     return None
 
 
-def assign_levels(todos: List[Dict[str, Any]]) -> Dict[str, int]:
+# Recently computed levels keyed by plan structure, oldest evicted first
+_LEVELS_CACHE_SIZE = 32
+_levels_cache: Dict[FrozenSet[Tuple[str, Tuple[str, ...]]], Dict[str, int]] = {}
+
+
+def assign_levels(
+    todos: List[Dict[str, Any]],
+    *,
+    todo_map: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, int]:
     """
     Assign dependency levels to TODOs.
 
     Args:
         todos: List of TODO dictionaries
+        todo_map: Optional prebuilt {id: todo} index of todos
 
     Returns:
         Dictionary mapping TODO ID to level
-    """
-    levels = {}
-    todo_map = {todo["id"]: todo for todo in todos}
-
-    def get_level(todo_id: str) -> int:
-        if todo_id in levels:
-            return levels[todo_id]
 
-        todo = todo_map[todo_id]
-        deps = todo.get("dependencies", [])
+    Raises:
+        ValueError: If circular dependencies detected
+    """
+    # Without any dependencies every TODO sits on level 0
+    if not any(todo.get("dependencies") for todo in todos):
+        return dict.fromkeys((todo["id"] for todo in todos), 0)
+
+    todo_map = todo_map or {todo["id"]: todo for todo in todos}
+    # Levels depend only on the id -> dependencies structure, so plans that
+    # share it (format_plan_markdown, calculate_priorities) share one walk
+    key = frozenset(
+        (todo_id, tuple(todo.get("dependencies", []))) for todo_id, todo in todo_map.items()
+    )
+    cached = _levels_cache.get(key)
+    if cached is not None:
+        return dict(cached)
 
-        if not deps:
-            levels[todo_id] = 0
-            return 0
+    levels = _compute_levels(todos, todo_map)
+    if len(_levels_cache) >= _LEVELS_CACHE_SIZE:
+        del _levels_cache[next(iter(_levels_cache))]
+    _levels_cache[key] = levels
+    return dict(levels)
 
-        max_dep_level = -1
-        for dep in deps:
-            if dep in todo_map:
-                dep_level = get_level(dep)
-                max_dep_level = max(max_dep_level, dep_level)
 
-        level = max_dep_level + 1
-        levels[todo_id] = level
-        return level
+def _compute_levels(todos: List[Dict[str, Any]], todo_map: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    levels: Dict[str, int] = {}
 
     for todo in todos:
-        get_level(todo["id"])
+        root = todo["id"]
+        if root in levels:
+            continue
+
+        # Iterative post-order DFS: a node's level is set once all of its
+        # dependencies have levels
+        stack = [(root, iter(todo_map[root].get("dependencies", [])))]
+        active = {root}
+        while stack:
+            todo_id, deps = stack[-1]
+            for dep in deps:
+                if dep in todo_map and dep not in levels:
+                    if dep in active:
+                        raise ValueError("Circular dependencies detected in TODO list")
+                    active.add(dep)
+                    stack.append((dep, iter(todo_map[dep].get("dependencies", []))))
+                    break
+            else:
+                stack.pop()
+                active.discard(todo_id)
+                dep_levels = [levels[dep] for dep in todo_map[todo_id].get("dependencies", []) if dep in todo_map]
+                levels[todo_id] = max(dep_levels, default=-1) + 1
 
     return levels
 
 
+# Leading quantity of an effort string such as "1.5 hours" or "30 minutes".
+_EFFORT_RE = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)(?:\s|$)")
+
+
+def _utc_date() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d")
+
+
 def format_plan_markdown(
     project_name: str,
     target_version: str,
     phases: List[Dict[str, Any]],
     todos: List[Dict[str, Any]],
     output_file: Optional[Path] = None,
+    *,
+    todo_map: Optional[Dict[str, Dict[str, Any]]] = None,
+    generated: Optional[str] = None,
 ) -> str:
     """
     Generate plan.md in Markdown format.
@@ -259,65 +323,56 @@ def format_plan_markdown(
         phases: List of phase dictionaries
         todos: List of TODO dictionaries
         output_file: Optional path to save plan
+        todo_map: Optional prebuilt {id: todo} index of todos
+        generated: Optional generation date (YYYY-MM-DD); defaults to today (UTC)
 
     Returns:
         Markdown content as string
     """
-    lines = [
-        f"# {project_name} Implementation Plan",
-        "",
-        f"**Generated:** {datetime.utcnow().strftime('%Y-%m-%d')}",
-        f"**Target Version:** {target_version}",
-        "",
-        "## Executive Summary",
-        "",
-        f"This plan outlines the implementation of {len(todos)} TODOs across {len(phases)} phases.",
-        "",
-        "## Implementation Roadmap",
-        "",
-    ]
+    if generated is None:
+        generated = _utc_date()
+    buf = io.StringIO()
+    w = buf.write
+
+    w(
+        f"# {project_name} Implementation Plan\n"
+        "\n"
+        f"**Generated:** {generated}\n"
+        f"**Target Version:** {target_version}\n"
+        "\n"
+        "## Executive Summary\n"
+        "\n"
+        f"This plan outlines the implementation of {len(todos)} TODOs across {len(phases)} phases.\n"
+        "\n"
+        "## Implementation Roadmap\n"
+        "\n"
+    )
 
     # Add phases
     for phase in phases:
-        lines.extend([
-            f"### {phase['name']}",
-            "",
-            f"**TODOs:** {len(phase['todos'])}",
-            "",
-            phase.get("description", ""),
-            "",
-        ])
-
-    lines.extend([
-        "## Dependency Order",
-        "",
-    ])
-
-    # Group TODOs by level
-    levels = assign_levels(todos)
-    todos_by_level = defaultdict(list)
-    for todo in todos:
-        level = levels[todo["id"]]
-        todos_by_level[level].append(todo)
-
-    for level in sorted(todos_by_level.keys()):
-        lines.append(f"### Level {level}")
-        lines.append("")
-        for todo in todos_by_level[level]:
-            lines.append(f"- **{todo['id']}:** {todo['title']}")
-        lines.append("")
-
-    lines.extend([
-        "## Success Criteria",
-        "",
-        "- All TODOs completed with double verification",
-        "- Logical and empirical tests passing",
-        "- Documentation updated",
-        "- No regressions in existing functionality",
-        "",
-    ])
-
-    content = "\n".join(lines)
+        w(f"### {phase['name']}\n\n**TODOs:** {len(phase['todos'])}\n\n{phase.get('description', '')}\n\n")
+
+    w("## Dependency Order\n\n")
+
+    # Group TODOs by level, highest priority first within each level
+    levels = assign_levels(todos, todo_map=todo_map)
+    by_level = sorted(todos, key=lambda todo: (levels[todo["id"]], todo.get("priority", 999)))
+    for level, level_todos in groupby(by_level, key=lambda todo: levels[todo["id"]]):
+        w(f"### Level {level}\n\n")
+        for todo in level_todos:
+            w(f"- **{todo['id']}:** {todo['title']}\n")
+        w("\n")
+
+    w(
+        "## Success Criteria\n"
+        "\n"
+        "- All TODOs completed with double verification\n"
+        "- Logical and empirical tests passing\n"
+        "- Documentation updated\n"
+        "- No regressions in existing functionality\n"
+    )
+
+    content = buf.getvalue()
 
     if output_file:
         output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -332,6 +387,8 @@ def format_todos_yaml(
     target_version: str,
     phases: Optional[List[Dict[str, Any]]] = None,
     output_file: Optional[Path] = None,
+    *,
+    generated: Optional[str] = None,
 ) -> str:
     """
     Generate TODOs.yaml in YAML format.
@@ -342,40 +399,38 @@ def format_todos_yaml(
         target_version: Target version
         phases: Optional list of phases
         output_file: Optional path to save YAML
+        generated: Optional generation date (YYYY-MM-DD); defaults to today (UTC)
 
     Returns:
         YAML content as string
     """
-    # Count by label
-    core_count = len([t for t in todos if t["label"] == "core"])
-    support_count = len([t for t in todos if t["label"] == "support"])
-    verify_count = len([t for t in todos if t["label"] == "verify"])
-
-    # Calculate total effort
+    # Count labels and total the effort in a single pass
+    label_counts: Counter = Counter()
     total_hours = 0.0
     for todo in todos:
+        label_counts[todo["label"]] += 1
         effort = todo.get("estimated_effort", "1 hour")
-        try:
-            # Parse effort string like "1 hour", "30 minutes", "1.5 hours"
-            if "hour" in effort:
-                hours = float(effort.split()[0])
-                total_hours += hours
-            elif "minute" in effort:
-                minutes = float(effort.split()[0])
-                total_hours += minutes / 60
-        except (ValueError, IndexError):
-            total_hours += 1.0  # Default to 1 hour
+        # Parse effort string like "1 hour", "30 minutes", "1.5 hours"
+        if "hour" in effort:
+            per_hour = 1.0
+        elif "minute" in effort:
+            per_hour = 60.0
+        else:
+            continue
+        match = _EFFORT_RE.match(effort)
+        # Default to 1 hour when the quantity is unreadable
+        total_hours += float(match.group(1)) / per_hour if match else 1.0
 
     data = {
         "version": "1.0",
-        "generated": datetime.utcnow().strftime("%Y-%m-%d"),
+        "generated": generated or _utc_date(),
         "project": f"{project_name} {target_version}",
         "todos": todos,
         "summary": {
             "total_todos": len(todos),
-            "core_todos": core_count,
-            "support_todos": support_count,
-            "verify_todos": verify_count,
+            "core_todos": label_counts["core"],
+            "support_todos": label_counts["support"],
+            "verify_todos": label_counts["verify"],
             "estimated_total_effort": f"{total_hours:.1f} hours",
         }
     }
@@ -390,7 +445,7 @@ def format_todos_yaml(
             })
         data["summary"]["phases"] = phase_summary
 
-    content = yaml.dump(data, sort_keys=False, allow_unicode=True, default_flow_style=False)
+    content = yaml.dump(data, Dumper=_YamlDumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
 
     if output_file:
         output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -403,6 +458,8 @@ def generate_plan(
     project_root: Path,
     feature_specs: List[Dict[str, Any]],
     output_dir: Optional[Path] = None,
+    *,
+    generated: Optional[str] = None,
 ) -> Tuple[str, List[Dict[str, Any]]]:
     """
     Generate complete execution plan with TODOs.
@@ -411,6 +468,7 @@ def generate_plan(
         project_root: Root directory of the project
         feature_specs: List of feature specifications
         output_dir: Optional directory to save outputs
+        generated: Optional generation date (YYYY-MM-DD); defaults to today (UTC)
 
     Returns:
         Tuple of (plan_markdown, todos_list)
@@ -438,9 +496,12 @@ def generate_plan(
             "todos": [t["id"] for t in feature_todos],
         })
 
+    # Shared by every helper below instead of each rebuilding it
+    todo_map = {todo["id"]: todo for todo in all_todos}
+
     # Order TODOs by dependencies
     try:
-        ordered_todos = order_by_dependencies(all_todos)
+        ordered_todos = order_by_dependencies(all_todos, todo_map=todo_map)
     except ValueError as e:
         # If cycles detected, return unordered
         print(f"Warning: {e}")
@@ -452,6 +513,8 @@ def generate_plan(
         target_version="0.4.0",
         phases=phases,
         todos=ordered_todos,
+        todo_map=todo_map,
+        generated=generated,
         output_file=output_dir / "plan.md" if output_dir else None,
     )
 
@@ -472,6 +535,11 @@ def validate_todo_count(todos: List[Dict[str, Any]], minimum: int = 20) -> bool:
     return len(todos) >= minimum
 
 
+# Keywords match as substrings ("testing", "configuration"), as they always have.
+_VERIFY_RE = re.compile("test|verify|validation", re.IGNORECASE)
+_SUPPORT_RE = re.compile("document|logging|monitoring|config", re.IGNORECASE)
+
+
 def label_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Auto-assign labels to TODOs based on keywords.
@@ -483,14 +551,13 @@ def label_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         TODOs with updated labels
     """
     for todo in todos:
-        title_lower = todo["title"].lower()
-        desc_lower = todo["description"].lower()
+        text = todo["title"] + "\n" + todo["description"]
 
         # Check for verification keywords
-        if any(word in title_lower or word in desc_lower for word in ["test", "verify", "validation"]):
+        if _VERIFY_RE.search(text):
             todo["label"] = "verify"
         # Check for support keywords
-        elif any(word in title_lower or word in desc_lower for word in ["document", "logging", "monitoring", "config"]):
+        elif _SUPPORT_RE.search(text):
             todo["label"] = "support"
         # Default to core
         elif "label" not in todo or not todo["label"]:
@@ -499,17 +566,22 @@ def label_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return todos
 
 
-def calculate_priorities(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def calculate_priorities(
+    todos: List[Dict[str, Any]],
+    *,
+    todo_map: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
     """
     Calculate priorities based on dependencies and labels.
 
     Args:
         todos: List of TODO dictionaries
+        todo_map: Optional prebuilt {id: todo} index of todos
 
     Returns:
         TODOs with updated priorities
     """
-    levels = assign_levels(todos)
+    levels = assign_levels(todos, todo_map=todo_map)
 
     for todo in todos:
         level = levels[todo["id"]]
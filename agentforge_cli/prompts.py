@@ -9,6 +9,23 @@ from typing import Dict, Iterable, List, Optional
 from .config import load_config, save_config
 
 
+_DEFAULT_TEMPLATE = textwrap.dedent(
+    """
+    You are AgentForge.
+    Task: {task_description}
+
+    Discipline:
+    {rules}
+
+    Memory:
+    {context}
+
+    Verification:
+    {verification}
+    """
+).strip()
+
+
 @dataclass
 class PromptRender:
     system_prompt: str
@@ -21,18 +38,28 @@ class SystemPromptManager:
 
     def __init__(self) -> None:
         self._config = load_config()
+        # The prompt settings only change through append_rule, so derive them once.
+        prompts = self._config.get("prompts", {})
+        self._base = prompts.get("base", "")
+        self._template = self._base or _DEFAULT_TEMPLATE
+        self._default_verification = tuple(prompts.get("default_verification", []))
+        self._set_rules(prompts.get("rules", []))
+
+    def _set_rules(self, rules: Iterable[str]) -> None:
+        self._rules = tuple(rules)
+        self._rules_section = "\n".join(f"- {rule}" for rule in self._rules)
 
     @property
     def rules(self) -> List[str]:
-        return list(self._config.get("prompts", {}).get("rules", []))
+        return list(self._rules)
 
     @property
     def base_template(self) -> str:
-        return self._config.get("prompts", {}).get("base", "")
+        return self._base
 
     @property
     def default_verification(self) -> List[str]:
-        return list(self._config.get("prompts", {}).get("default_verification", []))
+        return list(self._default_verification)
 
     def render(
         self,
@@ -42,44 +69,30 @@ class SystemPromptManager:
         verification_steps: Optional[Iterable[str]] = None,
     ) -> PromptRender:
         context_lines = [line.strip() for line in (context or []) if line and line.strip()]
-        verification = [step.strip() for step in (verification_steps or self.default_verification) if step]
+        verification = [step.strip() for step in (verification_steps or self._default_verification) if step]
         if not verification:
             verification = ["Run logical checks.", "Run empirical validation."]
 
         context_section = "\n".join(context_lines) if context_lines else "No relevant memory retrieved."
-        rules_section = "\n".join(f"- {rule}" for rule in self.rules)
         verification_section = "\n".join(f"- {step}" for step in verification)
 
-        template = self.base_template or textwrap.dedent(
-            """
-            You are AgentForge.
-            Task: {task_description}
-
-            Discipline:
-            {rules}
-
-            Memory:
-            {context}
-
-            Verification:
-            {verification}
-            """
-        ).strip()
-
-        system_prompt = template.format(
+        system_prompt = self._template.format(
             task_description=task_description,
-            rules=rules_section,
+            rules=self._rules_section,
             context=context_section,
             verification=verification_section,
         )
-        return PromptRender(system_prompt=system_prompt, rules=self.rules, verification=verification)
+        return PromptRender(system_prompt=system_prompt, rules=list(self._rules), verification=verification)
 
     def append_rule(self, rule: str) -> None:
-        prompts = self._config.setdefault("prompts", {})
-        rules = prompts.setdefault("rules", self.rules)
-        if rule not in rules:
-            rules.append(rule)
-            save_config(self._config)
+        if rule in self._rules:
+            return
+        # Copy rather than mutate: without a config file the loaded prompts
+        # section is shared with DEFAULT_CONFIG.
+        rules = [*self._rules, rule]
+        self._config["prompts"] = {**self._config.get("prompts", {}), "rules": rules}
+        save_config(self._config)
+        self._set_rules(rules)
 
 
 def default_prompt_manager() -> SystemPromptManager:
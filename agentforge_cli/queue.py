@@ -4,20 +4,25 @@ Task queue management.
 
 from __future__ import annotations
 
+import queue
+import re
 import sqlite3
 import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from croniter import croniter
 
 from . import constants
 from .config import get_runtime_settings, load_config
 from .logger import write_agent_log, write_system_log
-from .memory import default_memory_store
+from .memory import MemoryStore, default_memory_store
 from .prompts import default_prompt_manager
 from .runtime.dispatcher import AgentDispatcher, AutoscaleState
 from .verification import VerificationManager
@@ -56,13 +61,196 @@ CREATE TABLE IF NOT EXISTS scheduled_tasks (
 );
 """
 
+CONNECTION_PRAGMAS = [
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+]
+
+# Read-only connections kept beside the writer; under WAL they never block it.
+READER_POOL_SIZE = 4
+READER_PRAGMAS = CONNECTION_PRAGMAS + ["PRAGMA query_only=1"]
+
+# WAL lets dashboard and monitor connections read while workers write, and
+# synchronous=NORMAL drops the per-commit fsync that WAL makes unnecessary.
+WAL_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+]
+
+# WAL needs shared memory that network filesystems cannot provide, and the
+# journal mode persists in the file, so network_mode switches it back off.
+NETWORK_MODE_PRAGMAS = [
+    "PRAGMA journal_mode=DELETE",
+]
+
+INSERT_RELEASED_TASK_SQL = """
+INSERT INTO tasks (
+    description,
+    status,
+    created_at,
+    updated_at,
+    agent_model,
+    result,
+    attempts,
+    max_attempts,
+    available_at,
+    idempotency_key,
+    priority,
+    last_error
+)
+VALUES (?, 'pending', ?, ?, NULL, NULL, 0, 3, ?, NULL, 0, NULL)
+"""
+
+# Only pending schedules are ever scanned for due work, in scheduled_for order.
+CREATE_SCHEDULE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_sched_due ON scheduled_tasks(scheduled_for) WHERE status = 'pending'",
+]
+
 CREATE_TASK_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_tasks_pending ON tasks(status, available_at, priority DESC)",
     "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_idempotency ON tasks(idempotency_key)",
+    # Pending rows only, in claim order, so claim_task reads the first ready entry.
+    "CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks(priority DESC, available_at, id) WHERE status = 'pending'",
 ]
 
+# Column order shared by every query that is turned into a Task via _row_to_task.
+TASK_COLUMNS = (
+    "id, description, status, created_at, updated_at, agent_model, result, attempts, "
+    "max_attempts, available_at, idempotency_key, priority, last_error"
+)
+
+# TaskStore only executes these fixed strings, so sqlite3's per-connection
+# statement cache (keyed by SQL text) reuses each compiled statement.
+INSERT_TASK_SQL = """
+INSERT INTO tasks (
+    description,
+    status,
+    created_at,
+    updated_at,
+    agent_model,
+    result,
+    attempts,
+    max_attempts,
+    available_at,
+    idempotency_key,
+    priority,
+    last_error
+)
+VALUES (?, 'pending', ?, ?, ?, NULL, 0, ?, ?, ?, ?, NULL)
+"""
+
+SELECT_TASK_BY_KEY_SQL = "SELECT id FROM tasks WHERE idempotency_key = ?"
+
+# One statement for every limit; SQLite treats a negative LIMIT as unbounded.
+LIST_TASKS_SQL = f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY id LIMIT ?"
+
+# UPDATE ... RETURNING, used by CLAIM_TASK_SQL, arrived in SQLite 3.35.
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Select and claim in one statement; RETURNING yields the updated row. Without
+# ANALYZE statistics the planner would rather sort every ready row through
+# idx_tasks_pending, so the ordered partial index is named explicitly.
+CLAIM_TASK_SQL = f"""
+UPDATE tasks
+SET status = 'running', updated_at = :now, attempts = attempts + 1, last_error = NULL
+WHERE id = (
+    SELECT id FROM tasks INDEXED BY idx_tasks_claim
+    WHERE status = 'pending' AND available_at <= :now
+    ORDER BY priority DESC, available_at ASC, id ASC
+    LIMIT 1
+)
+RETURNING {TASK_COLUMNS}
+"""
+
+COMPLETE_TASK_SQL = (
+    "UPDATE tasks SET status = 'completed', updated_at = ?, result = ?, last_error = NULL WHERE id = ?"
+)
+
+RETRY_TASK_SQL = """
+UPDATE tasks
+SET status = 'pending',
+    updated_at = ?,
+    available_at = ?,
+    last_error = ?,
+    result = NULL
+WHERE id = ?
+"""
+
+FAIL_TASK_SQL = """
+UPDATE tasks
+SET status = 'failed',
+    updated_at = ?,
+    result = ?,
+    last_error = ?
+WHERE id = ?
+"""
+
+REQUEUE_RUNNING_SQL = """
+UPDATE tasks
+SET status = 'pending',
+    available_at = ?,
+    last_error = ?,
+    attempts = CASE WHEN attempts > 0 THEN attempts - 1 ELSE 0 END
+WHERE status = 'running'
+"""
+
+REQUEUE_TASK_SQL = """
+UPDATE tasks
+SET status = 'pending',
+    available_at = ?,
+    last_error = ?,
+    attempts = CASE WHEN attempts > 0 THEN attempts - 1 ELSE 0 END
+WHERE id = ? AND status = 'running'
+"""
+
+# Per-status totals plus how many are already due. Both columns come from
+# idx_tasks_pending, which leads with status, so SQLite scans that covering
+# index in group order without a temp b-tree.
+TASK_STATS_SQL = """
+SELECT status, COUNT(*), SUM(available_at <= :now)
+FROM tasks
+GROUP BY status
+"""
+
+PENDING_COUNT_SQL = "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND available_at <= ?"
+
+# Stops at the first ready row instead of counting them all.
+HAS_PENDING_SQL = "SELECT EXISTS (SELECT 1 FROM tasks WHERE status = 'pending' AND available_at <= ?)"
+
+INSERT_SCHEDULED_TASK_SQL = """
+INSERT INTO scheduled_tasks (
+    description,
+    scheduled_for,
+    created_at,
+    status,
+    cron_expression,
+    timezone,
+    max_runs
+)
+VALUES (?, ?, ?, 'pending', ?, ?, ?)
+"""
 
-@dataclass
+SELECT_DUE_SCHEDULED_SQL = """
+SELECT id, description, cron_expression, timezone, run_count, max_runs, scheduled_for
+FROM scheduled_tasks
+WHERE status = 'pending' AND scheduled_for <= ?
+ORDER BY scheduled_for
+LIMIT ?
+"""
+
+MARK_SCHEDULE_RELEASED_SQL = "UPDATE scheduled_tasks SET status = 'released', last_run = ? WHERE id = ?"
+
+RESCHEDULE_SQL = """
+UPDATE scheduled_tasks
+SET status = ?, run_count = ?, last_run = ?, scheduled_for = ?
+WHERE id = ?
+"""
+
+
+# Slotted: list_tasks can return thousands of these, and slots drop the per-instance __dict__.
+@dataclass(slots=True)
 class Task:
     id: int
     description: str
@@ -79,23 +267,163 @@ class Task:
     last_error: Optional[str]
 
 
-class TaskStore:
-    """Thread-safe wrapper for the SQLite task store."""
+def _utcnow() -> datetime:
+    """Naive UTC now, the form every TaskStore timestamp is stored in."""
+    return datetime.utcnow()
+
+
+def _now_iso() -> str:
+    return _utcnow().isoformat()
+
+
+# Tasks enqueued or touched together share timestamp strings (add_tasks stamps
+# a whole batch with one value), so repeated values skip the parse. datetimes
+# are immutable, which makes handing out the cached instance safe.
+@lru_cache(maxsize=4096)
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+# Minute/hour-only expressions ("*/15 * * * *", "30 * * * *", "0 9 * * *")
+# are stepped with datetime arithmetic; anything else goes through croniter.
+_SIMPLE_CRON_RE = re.compile(r"(\*|\d{1,2})(?:/(\d{1,2}))? (\*|\d{1,2}) \* \* \*")
+_CRON_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@midnight": "0 0 * * *"}
+# Upper bound on parsed croniter objects a TaskStore keeps; least recently used go first.
+_CRON_CACHE_SIZE = 128
+
+
+def _simple_cron_next(expression: str, base: datetime) -> Optional[datetime]:
+    """Next run strictly after ``base``, or None when croniter must evaluate ``expression``."""
+    match = _SIMPLE_CRON_RE.fullmatch(_CRON_ALIASES.get(expression, expression))
+    if match is None:
+        return None
+    minute, step, hour = match.groups()
+    start = base.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    if minute == "*" and hour == "*":
+        every = int(step) if step else 1
+        if not 0 < every < 60:
+            return None
+        # Steps restart at minute 0 each hour, as in cron.
+        wait = -start.minute % every
+        if start.minute + wait >= 60:
+            return start.replace(minute=0) + timedelta(hours=1)
+        return start + timedelta(minutes=wait)
+    if step is not None or minute == "*" or int(minute) > 59:
+        return None
+    if hour == "*":
+        candidate = start.replace(minute=int(minute))
+        return candidate if candidate >= start else candidate + timedelta(hours=1)
+    if int(hour) > 23:
+        return None
+    candidate = start.replace(hour=int(hour), minute=int(minute))
+    return candidate if candidate >= start else candidate + timedelta(days=1)
+
+
+def _row_to_task(row: Sequence[Any], updated_at: Optional[datetime] = None) -> Task:
+    """Build a Task from a row selected with ``TASK_COLUMNS``."""
+    (task_id, description, status, created_at, updated, agent_model, result,
+     attempts, max_attempts, available_at, idempotency_key, priority, last_error) = row
+    created = _parse_ts(created_at)
+    return Task(
+        task_id,
+        description,
+        status,
+        created,
+        updated_at or _parse_ts(updated),
+        agent_model,
+        result,
+        attempts,
+        max_attempts,
+        # A task that has never been delayed became available when it was created.
+        created if available_at == created_at else _parse_ts(available_at),
+        idempotency_key,
+        priority,
+        last_error,
+    )
+
+
+class _ReaderPool:
+    """Up to ``size`` read-only connections, opened on demand and reused LIFO."""
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, size: int) -> None:
         self.path = path
+        self.size = size
+        # LIFO hands out the most recently used connection, whose page cache is warmest.
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in READER_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class TaskStore:
+    """Thread-safe wrapper for the SQLite task store.
+
+    Writes go through ``conn`` under ``lock``; list_tasks, stats and
+    pending_count borrow a pooled read-only connection instead, so they do
+    not queue behind workers' writes.
+    """
+
+    def __init__(self, path: Path, *, network_mode: bool = False):
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            required = ".".join(map(str, MIN_SQLITE_VERSION))
+            raise RuntimeError(
+                f"AgentForge needs SQLite {required} or newer; this Python links {sqlite3.sqlite_version}."
+            )
+        self.path = path
+        self.network_mode = network_mode
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
-        self.lock = threading.Lock()
+        # Re-entrant so write methods can run inside transaction().
+        self.lock = threading.RLock()
+        self._in_transaction = False
+        # Signalled (under ``lock``) whenever new work becomes claimable, so idle
+        # workers can block in wait_for_task instead of polling the database.
+        self._work_ready = threading.Condition(self.lock)
+        self._closing = threading.Event()
+        # Parsed cron iterators keyed by expression (LRU, _CRON_CACHE_SIZE),
+        # rewound with set_current() per release; only touched inside
+        # transaction(), so under ``lock``.
+        self._cron_iterators: OrderedDict[str, croniter] = OrderedDict()
         self._bootstrap()
+        self._readers = _ReaderPool(path, READER_POOL_SIZE)
 
     def _bootstrap(self) -> None:
+        for pragma in CONNECTION_PRAGMAS + (NETWORK_MODE_PRAGMAS if self.network_mode else WAL_PRAGMAS):
+            self.conn.execute(pragma)
         self.conn.execute(CREATE_TASKS_SQL)
         self.conn.execute(CREATE_SCHEDULE_SQL)
         self._ensure_columns()
         self._ensure_schedule_columns()
-        for statement in CREATE_TASK_INDEXES:
+        for statement in CREATE_TASK_INDEXES + CREATE_SCHEDULE_INDEXES:
             self.conn.execute(statement)
         self.conn.commit()
 
@@ -134,8 +462,62 @@ class TaskStore:
             self.conn.execute(statement)
 
     def close(self) -> None:
+        self._readers.close()
         self.conn.close()
 
+    def wait_for_task(self, timeout: float) -> None:
+        """Block until work is enqueued, the store shuts down, or ``timeout`` elapses.
+
+        Only writes through this store wake waiters; tasks added by other
+        processes are picked up once the timeout lapses. After ``shutdown()``
+        this returns at once until ``resume()`` is called; ``AgentDispatcher``
+        does both around each run, so the store it was given comes back usable.
+        """
+        with self._work_ready:
+            if not self._closing.is_set():
+                self._work_ready.wait(timeout)
+
+    def wait_for_shutdown(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True early if the store shuts down."""
+        return self._closing.wait(timeout)
+
+    def shutdown(self) -> None:
+        """Wake every waiting worker and stop further waits from blocking."""
+        self._closing.set()
+        with self._work_ready:
+            self._work_ready.notify_all()
+
+    def resume(self) -> None:
+        """Undo ``shutdown()`` so waits block again."""
+        self._closing.clear()
+
+    @contextmanager
+    def transaction(self) -> Iterator[TaskStore]:
+        """Hold the write lock and group writes into a single commit.
+
+        Every write method runs inside one of these, so calls made within an
+        outer block share its BEGIN IMMEDIATE/COMMIT (one sync instead of one
+        per call), and everything rolls back if the block raises. Nested blocks
+        join the outermost one.
+        """
+        with self.lock:
+            if self._in_transaction:
+                yield self
+                return
+            # IMMEDIATE takes SQLite's write lock up front, so a read-then-write
+            # (idempotency check, due-schedule release) cannot race another process.
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield self
+            except BaseException:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._in_transaction = False
+
     def add_task(
         self,
         description: str,
@@ -146,40 +528,21 @@ class TaskStore:
         priority: int = 0,
         available_at: Optional[datetime] = None,
     ) -> int:
-        now = datetime.utcnow()
-        available_ts = (available_at or now).isoformat()
         if max_attempts < 1:
             raise ValueError("max_attempts must be at least 1")
-        with self.lock:
+        now_iso = _now_iso()
+        available_ts = available_at.isoformat() if available_at else now_iso
+        with self.transaction():
             if idempotency_key:
-                existing = self.conn.execute(
-                    "SELECT id FROM tasks WHERE idempotency_key = ?",
-                    (idempotency_key,),
-                ).fetchone()
+                existing = self.conn.execute(SELECT_TASK_BY_KEY_SQL, (idempotency_key,)).fetchone()
                 if existing:
                     return existing[0]
             cur = self.conn.execute(
-                """
-                INSERT INTO tasks (
-                    description,
-                    status,
-                    created_at,
-                    updated_at,
-                    agent_model,
-                    result,
-                    attempts,
-                    max_attempts,
-                    available_at,
-                    idempotency_key,
-                    priority,
-                    last_error
-                )
-                VALUES (?, 'pending', ?, ?, ?, NULL, 0, ?, ?, ?, ?, NULL)
-                """,
+                INSERT_TASK_SQL,
                 (
                     description,
-                    now.isoformat(),
-                    now.isoformat(),
+                    now_iso,
+                    now_iso,
                     agent_model,
                     max_attempts,
                     available_ts,
@@ -187,117 +550,68 @@ class TaskStore:
                     priority,
                 ),
             )
-            self.conn.commit()
+            self._work_ready.notify_all()
             task_id = cur.lastrowid
         write_system_log(f"Task {task_id} added: {description}")
         return task_id
 
-    def list_tasks(self, limit: Optional[int] = None) -> List[Task]:
-        query = (
-            "SELECT id, description, status, created_at, updated_at, agent_model, result, attempts, "
-            "max_attempts, available_at, idempotency_key, priority, last_error FROM tasks ORDER BY id"
-        )
-        if limit:
-            query += f" LIMIT {int(limit)}"
-        cur = self.conn.execute(query)
-        return [
-            Task(
-                id=row["id"],
-                description=row["description"],
-                status=row["status"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                agent_model=row["agent_model"],
-                result=row["result"],
-                attempts=row["attempts"],
-                max_attempts=row["max_attempts"],
-                available_at=datetime.fromisoformat(row["available_at"]),
-                idempotency_key=row["idempotency_key"],
-                priority=row["priority"],
-                last_error=row["last_error"],
-            )
-            for row in cur.fetchall()
+    def add_tasks(
+        self,
+        descriptions: Iterable[str],
+        agent_model: Optional[str] = None,
+        *,
+        max_attempts: int = 3,
+        priority: int = 0,
+    ) -> int:
+        """Enqueue many tasks in a single transaction and return how many were added."""
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        now_iso = _now_iso()
+        rows = [
+            (description, now_iso, now_iso, agent_model, max_attempts, now_iso, None, priority)
+            for description in descriptions
         ]
+        if not rows:
+            return 0
+        with self.transaction():
+            self.conn.executemany(INSERT_TASK_SQL, rows)
+            self._work_ready.notify_all()
+        write_system_log(f"{len(rows)} task(s) added in bulk")
+        return len(rows)
+
+    def list_tasks(self, limit: Optional[int] = None) -> List[Task]:
+        with self._readers.connection() as conn:
+            # _row_to_task unpacks positionally, so plain tuples skip building sqlite3.Row objects.
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(LIST_TASKS_SQL, (int(limit) if limit else -1,)).fetchall()
+        return [_row_to_task(row) for row in rows]
 
     def claim_task(self) -> Optional[Task]:
-        with self.lock:
-            now_iso = datetime.utcnow().isoformat()
-            cur = self.conn.execute(
-                """
-                SELECT id, description, status, created_at, updated_at, agent_model, result,
-                       attempts, max_attempts, available_at, idempotency_key, priority, last_error
-                FROM tasks
-                WHERE status = 'pending' AND available_at <= ?
-                ORDER BY priority DESC, available_at ASC, id ASC
-                LIMIT 1
-                """,
-                (now_iso,),
-            )
-            row = cur.fetchone()
-            if not row:
-                return None
-            new_attempts = row["attempts"] + 1
-            self.conn.execute(
-                "UPDATE tasks SET status = 'running', updated_at = ?, attempts = ?, last_error = NULL WHERE id = ?",
-                (now_iso, new_attempts, row["id"]),
-            )
-            self.conn.commit()
-        return Task(
-            id=row["id"],
-            description=row["description"],
-            status="running",
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(now_iso),
-            agent_model=row["agent_model"],
-            result=row["result"],
-            attempts=new_attempts,
-            max_attempts=row["max_attempts"],
-            available_at=datetime.fromisoformat(row["available_at"]),
-            idempotency_key=row["idempotency_key"],
-            priority=row["priority"],
-            last_error=row["last_error"],
-        )
+        with self.transaction():
+            now = _utcnow()
+            now_iso = now.isoformat()
+            # Tuple rows, as in list_tasks: _row_to_task only unpacks positionally.
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            row = cursor.execute(CLAIM_TASK_SQL, {"now": now_iso}).fetchone()
+        return _row_to_task(row, updated_at=now) if row else None
 
     def complete_task(self, task_id: int, result: str) -> None:
-        now = datetime.utcnow().isoformat()
-        with self.lock:
-            self.conn.execute(
-                "UPDATE tasks SET status = 'completed', updated_at = ?, result = ?, last_error = NULL WHERE id = ?",
-                (now, result, task_id),
-            )
-            self.conn.commit()
+        now = _now_iso()
+        with self.transaction():
+            self.conn.execute(COMPLETE_TASK_SQL, (now, result, task_id))
 
     def fail_task(self, task: Task, reason: str) -> None:
-        now = datetime.utcnow()
-        with self.lock:
+        now = _utcnow()
+        now_iso = now.isoformat()
+        with self.transaction():
             if task.attempts < task.max_attempts:
                 delay_seconds = min(2 ** task.attempts, 300)
                 available_at = (now + timedelta(seconds=delay_seconds)).isoformat()
-                self.conn.execute(
-                    """
-                    UPDATE tasks
-                    SET status = 'pending',
-                        updated_at = ?,
-                        available_at = ?,
-                        last_error = ?,
-                        result = NULL
-                    WHERE id = ?
-                    """,
-                    (now.isoformat(), available_at, reason, task.id),
-                )
+                self.conn.execute(RETRY_TASK_SQL, (now_iso, available_at, reason, task.id))
             else:
-                self.conn.execute(
-                    """
-                    UPDATE tasks
-                    SET status = 'failed',
-                        updated_at = ?,
-                        result = ?,
-                        last_error = ?
-                    WHERE id = ?
-                    """,
-                    (now.isoformat(), reason, reason, task.id),
-                )
-            self.conn.commit()
+                self.conn.execute(FAIL_TASK_SQL, (now_iso, reason, reason, task.id))
 
     def add_scheduled_task(
         self,
@@ -308,187 +622,114 @@ class TaskStore:
         timezone: Optional[str] = None,
         max_runs: Optional[int] = None,
     ) -> int:
-        now = datetime.utcnow().isoformat()
-        with self.lock:
+        now = _now_iso()
+        scheduled_iso = scheduled_for.isoformat()
+        with self.transaction():
             cur = self.conn.execute(
-                """
-                INSERT INTO scheduled_tasks (
-                    description,
-                    scheduled_for,
-                    created_at,
-                    status,
-                    cron_expression,
-                    timezone,
-                    max_runs
-                )
-                VALUES (?, ?, ?, 'pending', ?, ?, ?)
-                """,
-                (description, scheduled_for.isoformat(), now, cron_expression, timezone, max_runs),
+                INSERT_SCHEDULED_TASK_SQL,
+                (description, scheduled_iso, now, cron_expression, timezone, max_runs),
             )
-            self.conn.commit()
             task_id = cur.lastrowid
-        write_system_log(f"Scheduled task {task_id} for {scheduled_for.isoformat()}: {description}")
+        write_system_log(f"Scheduled task {task_id} for {scheduled_iso}: {description}")
         return task_id
 
     def release_due_scheduled(self, limit: Optional[int] = None) -> int:
-        now = datetime.utcnow().isoformat()
-        with self.lock:
-            cur = self.conn.execute(
-                """
-                SELECT id, description, cron_expression, timezone, run_count, max_runs, scheduled_for
-                FROM scheduled_tasks
-                WHERE status = 'pending' AND scheduled_for <= ?
-                ORDER BY scheduled_for
-                """,
-                (now,),
-            )
-            rows = cur.fetchall()
-            if not rows:
-                return 0
-            count = 0
+        now = _now_iso()
+        # The due rows are read and rewritten in one IMMEDIATE transaction, so two
+        # processes releasing at once cannot both pick up the same rows.
+        with self.transaction():
+            rows = self.conn.execute(SELECT_DUE_SCHEDULED_SQL, (now, limit or -1)).fetchall()
+            task_rows = []
+            released = []
+            rescheduled = []
             for row in rows:
                 cron_expression = row["cron_expression"]
-                release_description = row["description"]
+                task_rows.append((row["description"], now, now, now))
                 if cron_expression:
-                    self.conn.execute(
-                        """
-                        INSERT INTO tasks (
-                            description,
-                            status,
-                            created_at,
-                            updated_at,
-                            agent_model,
-                            result,
-                            attempts,
-                            max_attempts,
-                            available_at,
-                            idempotency_key,
-                            priority,
-                            last_error
-                        )
-                        VALUES (?, 'pending', ?, ?, NULL, NULL, 0, 3, ?, NULL, 0, NULL)
-                        """,
-                        (release_description, now, now, now),
-                    )
-                    next_base = datetime.fromisoformat(row["scheduled_for"])
-                    iterator = croniter(cron_expression, next_base)
-                    next_time = iterator.get_next(datetime)
+                    next_time = self._next_cron_time(cron_expression, _parse_ts(row["scheduled_for"]))
                     run_count = row["run_count"] + 1
                     max_runs = row["max_runs"]
-                    if max_runs is not None and run_count >= max_runs:
-                        self.conn.execute(
-                            """
-                            UPDATE scheduled_tasks
-                            SET status = 'completed', run_count = ?, last_run = ?, scheduled_for = ?
-                            WHERE id = ?
-                            """,
-                            (run_count, now, next_time.isoformat(), row["id"]),
-                        )
-                    else:
-                        self.conn.execute(
-                            """
-                            UPDATE scheduled_tasks
-                            SET run_count = ?, last_run = ?, scheduled_for = ?
-                            WHERE id = ?
-                            """,
-                            (run_count, now, next_time.isoformat(), row["id"]),
-                        )
+                    status = "completed" if max_runs is not None and run_count >= max_runs else "pending"
+                    rescheduled.append((status, run_count, now, next_time.isoformat(), row["id"]))
                 else:
-                    self.conn.execute(
-                        "UPDATE scheduled_tasks SET status = 'released' WHERE id = ?",
-                        (row["id"],),
-                    )
-                    self.conn.execute(
-                        """
-                        INSERT INTO tasks (
-                            description,
-                            status,
-                            created_at,
-                            updated_at,
-                            agent_model,
-                            result,
-                            attempts,
-                            max_attempts,
-                            available_at,
-                            idempotency_key,
-                            priority,
-                            last_error
-                        )
-                        VALUES (?, 'pending', ?, ?, NULL, NULL, 0, 3, ?, NULL, 0, NULL)
-                        """,
-                        (release_description, now, now, now),
-                    )
-                    self.conn.execute(
-                        "UPDATE scheduled_tasks SET last_run = ? WHERE id = ?",
-                        (now, row["id"]),
-                    )
-                count += 1
-                if limit and count >= limit:
-                    break
-            self.conn.commit()
+                    released.append((now, row["id"]))
+            # One statement per kind of write
+            if task_rows:
+                self.conn.executemany(INSERT_RELEASED_TASK_SQL, task_rows)
+                self._work_ready.notify_all()
+            if released:
+                self.conn.executemany(MARK_SCHEDULE_RELEASED_SQL, released)
+            if rescheduled:
+                self.conn.executemany(RESCHEDULE_SQL, rescheduled)
+        count = len(rows)
         if count:
             write_system_log(f"Released {count} scheduled task(s)")
         return count
 
+    def _next_cron_time(self, expression: str, base: datetime) -> datetime:
+        next_time = _simple_cron_next(expression, base)
+        if next_time is not None:
+            return next_time
+        iterator = self._cron_iterators.get(expression)
+        if iterator is None:
+            iterator = self._cron_iterators[expression] = croniter(expression, base)
+            if len(self._cron_iterators) > _CRON_CACHE_SIZE:
+                self._cron_iterators.popitem(last=False)
+        else:
+            self._cron_iterators.move_to_end(expression)
+            iterator.set_current(base, force=True)
+        return iterator.get_next(datetime)
+
     def stats(self) -> Dict[str, int]:
-        with self.lock:
-            now_iso = datetime.utcnow().isoformat()
-            total = self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
-            pending_ready = self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND available_at <= ?",
-                (now_iso,),
-            ).fetchone()[0]
-            pending_delayed = self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND available_at > ?",
-                (now_iso,),
-            ).fetchone()[0]
-            running = self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'running'"
-            ).fetchone()[0]
-            completed = self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'completed'"
-            ).fetchone()[0]
-            failed = self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'failed'"
-            ).fetchone()[0]
+        now_iso = _now_iso()
+        with self._readers.connection() as conn:
+            rows = conn.execute(TASK_STATS_SQL, {"now": now_iso}).fetchall()
+        counts = {status: (count, ready) for status, count, ready in rows}
+        pending, pending_ready = counts.get("pending", (0, 0))
         return {
-            "total": total,
+            "total": sum(count for count, _ in counts.values()),
             "pending": pending_ready,
-            "delayed": pending_delayed,
-            "running": running,
-            "completed": completed,
-            "failed": failed,
+            "delayed": pending - pending_ready,
+            "running": counts.get("running", (0, 0))[0],
+            "completed": counts.get("completed", (0, 0))[0],
+            "failed": counts.get("failed", (0, 0))[0],
         }
 
     def pending_count(self) -> int:
-        with self.lock:
-            now_iso = datetime.utcnow().isoformat()
-            return self.conn.execute(
-                "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND available_at <= ?",
-                (now_iso,),
-            ).fetchone()[0]
+        now_iso = _now_iso()
+        with self._readers.connection() as conn:
+            return conn.execute(PENDING_COUNT_SQL, (now_iso,)).fetchone()[0]
+
+    def has_pending(self) -> bool:
+        """Whether any task is ready to claim; cheaper than ``pending_count() > 0``."""
+        now_iso = _now_iso()
+        with self._readers.connection() as conn:
+            return bool(conn.execute(HAS_PENDING_SQL, (now_iso,)).fetchone()[0])
 
     def requeue_running(self, reason: str = "Interrupted during shutdown") -> int:
-        now_iso = datetime.utcnow().isoformat()
-        with self.lock:
-            cur = self.conn.execute(
-                """
-                UPDATE tasks
-                SET status = 'pending',
-                    available_at = ?,
-                    last_error = ?,
-                    attempts = CASE WHEN attempts > 0 THEN attempts - 1 ELSE 0 END
-                WHERE status = 'running'
-                """,
-                (now_iso, reason),
-            )
-            self.conn.commit()
-            return cur.rowcount
+        now_iso = _now_iso()
+        with self.transaction():
+            cur = self.conn.execute(REQUEUE_RUNNING_SQL, (now_iso, reason))
+            self._work_ready.notify_all()
+        return cur.rowcount
+
+    def requeue_task(self, task_id: int, reason: str = "Interrupted during shutdown") -> None:
+        """Return one running task to the queue without charging it an attempt."""
+        now_iso = _now_iso()
+        with self.transaction():
+            self.conn.execute(REQUEUE_TASK_SQL, (now_iso, reason, task_id))
+            self._work_ready.notify_all()
+
+
+def default_task_store() -> TaskStore:
+    """Open the task database under the current ``AGENTFORGE_HOME``."""
+    constants.refresh_paths()
+    network_mode = bool(get_runtime_settings().get("network_mode", False))
+    return TaskStore(constants.TASK_DB, network_mode=network_mode)
 
 
 def run_task_loop(concurrency: int, agent_model: Optional[str] = None, autoscale: Optional[bool] = None) -> None:
-    constants.refresh_paths()
-    store = TaskStore(constants.TASK_DB)
+    store = default_task_store()
     config = load_config()
     agent_defaults = config.get("models", {}).get("agent", {})
     resolved_model = agent_model or agent_defaults.get("name", config["agent_model"])
@@ -505,12 +746,17 @@ def run_task_loop(concurrency: int, agent_model: Optional[str] = None, autoscale
             scale_down_idle_cycles=int(autoscale_cfg.get("scale_down_idle_cycles", 3)),
         )
 
+    # Create the memory schema and switch it to WAL before workers start; twenty
+    # workers racing to do it on a fresh file can fail with "database is locked".
+    default_memory_store().close()
+
     dispatcher = AgentDispatcher(
         store=store,
         agent_model=resolved_model,
         process=_process_task,
         initial_concurrency=concurrency or runtime.get("default_concurrency", 10),
         autoscale=autoscale_state,
+        on_worker_exit=_close_worker_memory_store,
     )
 
     try:
@@ -520,19 +766,44 @@ def run_task_loop(concurrency: int, agent_model: Optional[str] = None, autoscale
         pending = store.requeue_running()
         write_system_log(f"Requeued {pending} running task(s) for future execution.", level="WARN")
     finally:
+        store.shutdown()
         store.close()
         write_system_log("Queue run completed.")
 
 
+# Each dispatcher worker thread keeps one MemoryStore open across its tasks;
+# the dispatcher closes it through on_worker_exit as the thread finishes.
+_worker_state = threading.local()
+
+
+def _worker_memory_store() -> MemoryStore:
+    memory_store = getattr(_worker_state, "memory_store", None)
+    if memory_store is None:
+        memory_store = _worker_state.memory_store = default_memory_store()
+    return memory_store
+
+
+def _close_worker_memory_store(worker_id: int) -> None:
+    memory_store = getattr(_worker_state, "memory_store", None)
+    if memory_store is not None:
+        _worker_state.memory_store = None
+        memory_store.close()
+
+
+def _abandon_task(worker_id: int, store: TaskStore, task: Task) -> None:
+    store.requeue_task(task.id)
+    write_agent_log(worker_id, f"Task {task.id}: Interrupted by shutdown; requeued")
+
+
 def _process_task(worker_id: int, store: TaskStore, task: Task, agent_model: str) -> None:
     """Simulate task execution with verification steps."""
     current_config = load_config()
     active_agent_model = current_config.get("models", {}).get("agent", {}).get("name", agent_model)
+    simulate_work = bool(current_config.get("runtime", {}).get("simulate_work", False))
     memory_context: List[str] = []
     try:
-        with default_memory_store() as memory_store:
-            candidates = memory_store.search(task.description, limit=3)
-            memory_context = [record.content for record in candidates]
+        candidates = _worker_memory_store().search(task.description, limit=3)
+        memory_context = [record.content for record in candidates]
     except Exception as exc:  # pragma: no cover
         write_system_log(f"Memory retrieval error for task {task.id}: {exc}")
 
@@ -550,8 +821,10 @@ def _process_task(worker_id: int, store: TaskStore, task: Task, agent_model: str
         write_agent_log(worker_id, f"  {line}")
 
     write_agent_log(worker_id, f"Task {task.id}: Execution started")
-    # Simulate work
-    time.sleep(0.5)
+    # Optional simulated work; the waits end early when the store shuts down
+    if simulate_work and store.wait_for_shutdown(0.5):
+        _abandon_task(worker_id, store, task)
+        return
     # Logical verification
     agent_identifier = f"agent-{worker_id:03d}"
     verifier = VerificationManager()
@@ -568,28 +841,28 @@ def _process_task(worker_id: int, store: TaskStore, task: Task, agent_model: str
         )
         return
     # Empirical verification (simulated)
-    time.sleep(0.2)
+    if simulate_work and store.wait_for_shutdown(0.2):
+        _abandon_task(worker_id, store, task)
+        return
     result_message = f"Completed with {active_agent_model}"
     memory_entry_id: Optional[int] = None
     try:
-        with default_memory_store() as memory_store:
-            memory_entry_id = memory_store.add_memory(
-                agent_id=agent_identifier,
-                content=f"Task {task.id}: {task.description} -> {result_message}",
-                metadata={
-                    "task_id": task.id,
-                    "agent_model": active_agent_model,
-                    "attempts": task.attempts,
-                },
-            )
+        memory_entry_id = _worker_memory_store().add_memory(
+            agent_id=agent_identifier,
+            content=f"Task {task.id}: {task.description} -> {result_message}",
+            metadata={
+                "task_id": task.id,
+                "agent_model": active_agent_model,
+                "attempts": task.attempts,
+            },
+        )
         write_agent_log(worker_id, f"Task {task.id}: Memory recorded (entry {memory_entry_id})")
     except Exception as exc:  # pragma: no cover - best effort
         write_system_log(f"Memory store error for task {task.id}: {exc}")
 
     def empirical_runner() -> tuple[bool, str]:
         try:
-            with default_memory_store() as memory_store:
-                results = memory_store.search(task.description, limit=1, agent_id=agent_identifier)
+            results = _worker_memory_store().search(task.description, limit=1, agent_id=agent_identifier)
         except Exception as exc:  # pragma: no cover
             return False, f"Memory search failed: {exc}"
         if results:
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from . import constants
+from .jsonio import dumps, loads
 
 
 def generate_final_report(report_path: Optional[Path] = None) -> Path:
@@ -15,8 +15,7 @@ def generate_final_report(report_path: Optional[Path] = None) -> Path:
     todos_path = Path(".agentforge/todos.json")
     if not todos_path.exists():
         raise FileNotFoundError("TODO tracking file not found.")
-    with todos_path.open("r", encoding="utf-8") as fh:
-        todos = json.load(fh).get("todos", [])
+    todos = loads(todos_path.read_bytes()).get("todos", [])
 
     if report_path is None:
         report_path = Path("reports/final_verification.json")
@@ -31,7 +30,7 @@ def generate_final_report(report_path: Optional[Path] = None) -> Path:
             "reports/loadtest.json",
         ],
     }
-    report_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    report_path.write_bytes(dumps(payload, indent=True))
     return report_path
 
 
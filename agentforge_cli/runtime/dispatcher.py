@@ -35,11 +35,14 @@ class AgentDispatcher:
         process: Callable[[int, TaskStore, Task, str], None],
         initial_concurrency: Optional[int] = None,
         autoscale: Optional[AutoscaleState] = None,
+        on_worker_exit: Optional[Callable[[int], None]] = None,
     ) -> None:
         settings = get_runtime_settings()
         self.store = store
         self.agent_model = agent_model
         self.process = process
+        # Called on the worker's own thread as it exits, to release per-worker resources.
+        self.on_worker_exit = on_worker_exit
         self.runtime_settings = settings
         default = initial_concurrency or settings.get("default_concurrency", 10)
         max_concurrency = settings.get("max_concurrency", 500)
@@ -65,7 +68,12 @@ class AgentDispatcher:
 
     # ------------------------------------------------------------------
     def run(self) -> None:
-        """Run until queue is drained and workers are idle."""
+        """Run until queue is drained and workers are idle.
+
+        On exit the store is shut down, which wakes workers blocked waiting
+        for tasks or sleeping inside ``process``; once they have exited it is
+        resumed, since the store belongs to the caller.
+        """
 
         manager_thread = threading.Thread(target=self._manage_pool, name="AgentDispatcherManager", daemon=True)
         manager_thread.start()
@@ -75,13 +83,15 @@ class AgentDispatcher:
                     break
                 if self._all_tasks_completed():
                     # Ensure no pending work before exiting
-                    if self.store.pending_count() == 0 and not self._has_running_workers():
+                    if not self.store.has_pending() and not self._has_running_workers():
                         break
                 time.sleep(0.2)
         finally:
             self.stop_event.set()
+            self.store.shutdown()
             manager_thread.join()
             self._join_workers()
+            self.store.resume()
             write_system_log("Agent dispatcher run finished")
 
     # ------------------------------------------------------------------
@@ -153,7 +163,7 @@ class AgentDispatcher:
                     self.worker_states[worker_id] = "idle"
                     if idle_cycles >= self.autoscale.scale_down_idle_cycles and worker_id in self.workers and len(self.workers) > self.target_concurrency:
                         break
-                    time.sleep(0.5)
+                    self.store.wait_for_task(timeout=0.5)
                     continue
 
                 idle_cycles = 0
@@ -169,6 +179,11 @@ class AgentDispatcher:
 
             write_agent_log(worker_id, "Worker shutting down")
         finally:
+            if self.on_worker_exit is not None:
+                try:
+                    self.on_worker_exit(worker_id)
+                except Exception as exc:  # pragma: no cover - cleanup is best effort
+                    write_agent_log(worker_id, f"Worker cleanup error: {exc}")
             with self._lock:
                 self.workers.pop(worker_id, None)
                 self.worker_states.pop(worker_id, None)
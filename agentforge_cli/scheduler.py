@@ -13,8 +13,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import click
 
-from . import constants
-from .queue import TaskStore
+from .queue import default_task_store
 from .constants import SCHEDULE_POLL_INTERVAL
 from .logger import write_system_log
 from croniter import croniter
@@ -91,8 +90,7 @@ def parse_schedule_time(value: Optional[str], *, cron: Optional[str] = None, tz:
 
 
 def add_scheduled_task(description: str, spec: ScheduleSpec) -> int:
-    constants.refresh_paths()
-    store = TaskStore(constants.TASK_DB)
+    store = default_task_store()
     try:
         return store.add_scheduled_task(
             description,
@@ -106,8 +104,7 @@ def add_scheduled_task(description: str, spec: ScheduleSpec) -> int:
 
 
 def release_due_tasks(limit: Optional[int] = None) -> int:
-    constants.refresh_paths()
-    store = TaskStore(constants.TASK_DB)
+    store = default_task_store()
     try:
         return store.release_due_scheduled(limit=limit)
     finally:
@@ -37,6 +37,15 @@ def test_dashboard_serves_html(tmp_path, monkeypatch) -> None:
         assert response.status_code in {302, 303}
         config = load_config()
         assert config["models"]["primary"]["name"] == constants.DEFAULT_MODELS[0]
+
+        # Model changes must not be hidden behind the cached homepage.
+        requests.get(
+            f"http://{host}:{port}/model?target=anthropic:{constants.DEFAULT_MODELS[2]}",
+            allow_redirects=False,
+            timeout=5,
+        )
+        response = requests.get(f"http://{host}:{port}/", timeout=5)
+        assert f"value='anthropic:{constants.DEFAULT_MODELS[2]}' selected" in response.text
     finally:
         server.shutdown()
         thread.join(timeout=2)
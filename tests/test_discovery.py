@@ -0,0 +1,34 @@
+"""Tests for project discovery helpers."""
+
+from pathlib import Path
+
+import pytest
+
+from agentforge_cli import discovery
+from agentforge_cli.discovery import _count_lines
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b"a\nb\n\nc", 3),
+        (b"a\rb\rc\r", 3),
+        (b"a\nb\rc", 3),
+        (b"a\r\n\r\nb\r\n", 2),
+        (b"\xc2\xa0\nx\n", 1),
+        (b"\xff\nx\n", 1),
+        (b"", 0),
+    ],
+)
+def test_count_lines_matches_text_mode_rules(tmp_path: Path, content: bytes, expected: int) -> None:
+    path = tmp_path / "file.py"
+    path.write_bytes(content)
+    assert _count_lines(path) == expected
+
+
+def test_count_lines_across_chunk_boundaries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(discovery, "_READ_CHUNK_BYTES", 3)
+    path = tmp_path / "file.py"
+    # The CRLF and the three-byte character both straddle a chunk boundary.
+    path.write_bytes(b"ab\r\n\xc2\xa0\n\xe3\x81\x82\n")
+    assert _count_lines(path) == 2
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import pytest
 
@@ -48,8 +50,12 @@ def test_dispatcher_processes_tasks(store: TaskStore) -> None:
 def test_dispatcher_autoscale_adjusts_target(store: TaskStore) -> None:
     _add_tasks(store, 15)
     completed: List[int] = []
+    # Hold the backlog until the manager has looked at it once; otherwise the
+    # first workers can drain it before autoscale ever sees pending work.
+    evaluated = threading.Event()
 
     def process(worker_id: int, task_store: TaskStore, task: Task, model: str) -> None:
+        evaluated.wait(timeout=5)
         completed.append(task.id)
         task_store.complete_task(task.id, "done")
 
@@ -67,9 +73,54 @@ def test_dispatcher_autoscale_adjusts_target(store: TaskStore) -> None:
         initial_concurrency=2,
         autoscale=autoscale_state,
     )
+    evaluate_autoscale = dispatcher._evaluate_autoscale
+
+    def evaluate_then_release() -> None:
+        evaluate_autoscale()
+        evaluated.set()
+
+    dispatcher._evaluate_autoscale = evaluate_then_release
     dispatcher.run()
     assert len(completed) == 15
     assert dispatcher.target_concurrency >= 2
 
     stats = store.stats()
     assert stats["pending"] == 0
+
+
+def test_dispatcher_runs_exit_hook_on_each_worker_thread(store: TaskStore) -> None:
+    _add_tasks(store, 4)
+    worker_threads: Dict[int, int] = {}
+    exits: Dict[int, int] = {}
+
+    def process(worker_id: int, task_store: TaskStore, task: Task, model: str) -> None:
+        worker_threads[worker_id] = threading.get_ident()
+        task_store.complete_task(task.id, "done")
+
+    def on_worker_exit(worker_id: int) -> None:
+        exits[worker_id] = threading.get_ident()
+
+    dispatcher = AgentDispatcher(
+        store=store,
+        agent_model="claude",
+        process=process,
+        initial_concurrency=2,
+        on_worker_exit=on_worker_exit,
+    )
+    dispatcher.run()
+    assert worker_threads
+    assert {worker_id: exits.get(worker_id) for worker_id in worker_threads} == worker_threads
+
+
+def test_dispatcher_leaves_store_reusable(store: TaskStore) -> None:
+    _add_tasks(store, 2)
+
+    def process(worker_id: int, task_store: TaskStore, task: Task, model: str) -> None:
+        task_store.complete_task(task.id, "done")
+
+    AgentDispatcher(store=store, agent_model="claude", process=process, initial_concurrency=1).run()
+
+    assert store.wait_for_shutdown(0.05) is False
+    started = time.monotonic()
+    store.wait_for_task(timeout=0.3)
+    assert time.monotonic() - started >= 0.25
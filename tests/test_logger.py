@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+import subprocess
+import sys
+import threading
 from pathlib import Path
 
 import pytest
 
 from agentforge_cli import constants
-from agentforge_cli.logger import agent_log_path, write_agent_log, write_system_log
+from agentforge_cli.logger import agent_log_path, flush, reconfigure, write_agent_log, write_system_log
 
 
 @pytest.fixture(autouse=True)
@@ -18,6 +21,7 @@ def set_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 
 def test_agent_logs_are_json(tmp_path: Path):
     write_agent_log(1, "Executed task", extra={"task_id": 123})
+    flush()
     path = agent_log_path(1)
     data = [json.loads(line) for line in path.read_text().splitlines() if line]
     assert data[0]["agent_id"] == "agent-001"
@@ -28,9 +32,59 @@ def test_system_log_rotation(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr("agentforge_cli.logger.MAX_LOG_BYTES", 200)
     for idx in range(50):
         write_system_log(f"entry {idx}")
+    flush()
     log_path = constants.SYSTEM_LOG_FILE
     assert log_path.exists()
     rotated = Path(f"{log_path}.1")
     assert rotated.exists()
     with log_path.open("r", encoding="utf-8") as fh:
         json.loads(fh.readline())
+
+
+def test_reconfigure_follows_new_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    other = tmp_path / "other"
+    monkeypatch.setenv("AGENTFORGE_HOME", str(other))
+    reconfigure()
+    write_system_log("moved")
+    flush()
+    assert constants.SYSTEM_LOG_FILE == other / "logs" / "system.log"
+    assert constants.SYSTEM_LOG_FILE.exists()
+
+
+def test_cli_help_does_not_start_log_writer():
+    # A fresh interpreter, since this process has already started the writer.
+    # The check is registered first so it runs after the logger's atexit hook.
+    script = (
+        "import atexit, sys\n"
+        "atexit.register(lambda: print(sys.modules['agentforge_cli.logger']._writer_thread is None))\n"
+        "from agentforge_cli.cli import cli\n"
+        "cli.main(['init', '--help'], standalone_mode=False)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == "True"
+
+
+def test_flush_waits_for_writes_from_every_thread():
+    def worker(agent_id: int) -> None:
+        for idx in range(50):
+            write_agent_log(agent_id, f"step {idx}")
+
+    threads = [threading.Thread(target=worker, args=(agent_id,)) for agent_id in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    flush()
+    for agent_id in range(1, 5):
+        lines = agent_log_path(agent_id).read_text().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == [f"step {idx}" for idx in range(50)]
+
+
+def test_unserialisable_payload_fails_at_call_site():
+    write_system_log("before")
+    with pytest.raises(TypeError):
+        write_system_log("bad", extra={"path": constants.LOG_DIR})
+    write_system_log("after")
+    flush()
+    lines = constants.SYSTEM_LOG_FILE.read_text().splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["before", "after"]
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
+import subprocess
+import sys
 from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
-from agentforge_cli.memory import MemoryStore
+from agentforge_cli.memory import MemoryStore, _token_buckets, _vectorize
 from agentforge_cli.cli import cli
 
 
@@ -27,3 +33,158 @@ def test_memory_cli_search(tmp_path: Path, monkeypatch) -> None:
     result = runner.invoke(cli, ["memory", "search", "backoff"])
     assert result.exit_code == 0
     assert "backoff" in result.output.lower()
+
+
+def test_memory_store_migrates_json_embeddings(tmp_path: Path) -> None:
+    store_path = tmp_path / "memory.db"
+    conn = sqlite3.connect(store_path)
+    conn.execute(
+        """
+        CREATE TABLE memories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            agent_id TEXT NOT NULL,
+            content TEXT NOT NULL,
+            metadata TEXT,
+            embedding TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    embedding = [0.0] * 128
+    embedding[0] = 1.0
+    conn.execute(
+        "INSERT INTO memories(agent_id, content, metadata, embedding, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        ("agent-001", "legacy row", json.dumps({"task_id": 7}), json.dumps(embedding), "2024-01-01T00:00:00", "2024-01-01T00:00:00"),
+    )
+    conn.commit()
+    conn.close()
+
+    with MemoryStore(store_path) as store:
+        kinds = store.conn.execute("SELECT typeof(embedding) FROM memories").fetchall()
+        results = store.search("legacy")
+    assert [row[0] for row in kinds] == ["blob"]
+    assert results[0].metadata["task_id"] == 7
+
+
+def test_memory_search_sees_writes_from_other_connections(tmp_path: Path) -> None:
+    store_path = tmp_path / "memory.db"
+    with MemoryStore(store_path) as reader, MemoryStore(store_path) as writer:
+        writer.add_memory("agent-001", "Implemented OAuth flow", {"task_id": 1})
+        assert reader.search("oauth")[0].metadata["task_id"] == 1
+        writer.add_memory("agent-002", "Tuned dashboard cache", {"task_id": 2})
+        results = reader.search("dashboard", agent_id="agent-002")
+    assert [record.metadata["task_id"] for record in results] == [2]
+
+
+def test_memory_search_shortlists_large_stores(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("agentforge_cli.memory._LSH_MIN_CANDIDATES", 20)
+    with MemoryStore(tmp_path / "memory.db") as store:
+        for idx in range(40):
+            store.add_memory("agent-001", f"routine note number {idx}", {"task_id": idx})
+        store.add_memory("agent-002", "Refined scheduler cron support", {"task_id": 99})
+        codes = store.conn.execute("SELECT COUNT(*) FROM memories WHERE code IS NULL").fetchone()[0]
+        results = store.search("scheduler cron support", limit=1)
+    assert codes == 0
+    assert [record.metadata["task_id"] for record in results] == [99]
+
+
+def test_vectorize_results_are_cached_and_read_only() -> None:
+    _vectorize.cache_clear()
+    first = _vectorize("Queue retry backoff")
+    assert _vectorize("Queue retry backoff") is first
+    assert first.readonly
+
+
+def test_add_memories_returns_ids_in_order(tmp_path: Path) -> None:
+    with MemoryStore(tmp_path / "memory.db") as store:
+        first = store.add_memory("agent-001", "Implemented OAuth flow")
+        ids = store.add_memories(
+            [
+                ("agent-001", "Queue retry backoff implemented", {"task_id": 10}),
+                ("agent-002", "Refined scheduler cron support", None),
+            ]
+        )
+        assert store.add_memories([]) == []
+        rows = dict(store.conn.execute("SELECT id, content FROM memories").fetchall())
+        results = store.search("scheduler", limit=1)
+    assert ids == [first + 1, first + 2]
+    assert rows[ids[0]] == "Queue retry backoff implemented"
+    assert results[0].id == ids[1]
+
+
+def test_memory_store_uses_wal(tmp_path: Path) -> None:
+    with MemoryStore(tmp_path / "memory.db") as store:
+        mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_memory_search_prefilters_with_full_text_index(tmp_path: Path) -> None:
+    with MemoryStore(tmp_path / "memory.db") as store:
+        store.add_memories(
+            [("agent-001", f"routine note number {idx}", {"task_id": idx}) for idx in range(20)]
+        )
+        store.add_memory("agent-002", "Scheduling cron jobs for the dashboard", {"task_id": 99})
+        matches = store.conn.execute(
+            "SELECT rowid FROM memories_fts WHERE memories_fts MATCH 'schedule'"
+        ).fetchall()
+        results = store.search("schedule dashboard", limit=1)
+    assert len(matches) == 1
+    assert results[0].metadata["task_id"] == 99
+
+
+def test_token_buckets_are_stable_across_processes() -> None:
+    script = "from agentforge_cli.memory import _token_buckets; print(_token_buckets('Queue retry Backoff'))"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert outputs == {f"{_token_buckets('queue retry backoff')}\n"}
+
+
+def test_token_buckets_fold_case() -> None:
+    assert _token_buckets("Queue RETRY backoff") == _token_buckets("queue retry backoff")
+    assert _token_buckets("Café Déjà") == _token_buckets("café déjà")
+
+
+def test_memory_search_reranks_quantized_candidates(tmp_path: Path) -> None:
+    with MemoryStore(tmp_path / "memory.db") as store:
+        store.add_memory("agent-001", "Queue retry backoff implemented", {"task_id": 10})
+        codes = store.conn.execute("SELECT length(code_i8), length(embedding) FROM memories").fetchone()
+        results = store.search("queue retry backoff implemented", limit=1)
+    assert tuple(codes) == (128, 512)
+    assert abs(results[0].similarity - 1.0) < 1e-6
+
+
+def test_memory_transaction_commits_once(tmp_path: Path) -> None:
+    store_path = tmp_path / "memory.db"
+    with MemoryStore(store_path) as store, MemoryStore(store_path) as observer:
+        with store.transaction():
+            store.add_memory("agent-001", "Implemented OAuth flow")
+            store.add_memory("agent-001", "Queue retry backoff implemented")
+            assert observer.conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 0
+        assert observer.conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 2
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.add_memory("agent-001", "Discarded note")
+                raise RuntimeError("abort")
+        assert store.conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 2
+
+
+def test_memory_search_scores_small_stores_exactly(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(vector):
+        raise AssertionError("query LSH code computed below the shortlist threshold")
+
+    with MemoryStore(tmp_path / "memory.db") as store:
+        for idx in range(60):
+            store.add_memory("agent-001", f"routine note number {idx}", {"task_id": idx})
+        monkeypatch.setattr("agentforge_cli.memory._lsh_code", fail)
+        results = store.search("routine note number 42", limit=1)
+    assert results[0].metadata["task_id"] == 42
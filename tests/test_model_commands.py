@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
 from agentforge_cli.cli import cli
-from agentforge_cli.config import get_paths, load_config
+from agentforge_cli.config import get_paths, load_config, save_config
 
 
 @pytest.fixture
@@ -42,3 +43,23 @@ def test_model_set_rejects_unknown_provider(runner: CliRunner) -> None:
     result = runner.invoke(cli, ["model", "set", "unknown:demo"], catch_exceptions=False)
     assert result.exit_code != 0
     assert "Unknown model" in result.output or "provider" in result.output
+
+
+def test_load_config_returns_independent_copies(runner: CliRunner) -> None:
+    first = load_config()
+    first["models"]["agent"]["name"] = "mutated"
+    assert load_config()["models"]["agent"]["name"] != "mutated"
+
+    first["agent_model"] = "saved-model"
+    save_config(first)
+    assert load_config()["agent_model"] == "saved-model"
+
+
+def test_load_config_rereads_external_edits(runner: CliRunner) -> None:
+    config_file = get_paths()["config_file"]
+    load_config()
+    text = config_file.read_text(encoding="utf-8")
+    config_file.write_text(text + "external_flag: true\n", encoding="utf-8")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_config()["external_flag"] is True
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import socket
 import threading
 import time
 
 import pytest
 import requests
 
-from agentforge_cli.oauth import OAuthRedirectServer, find_open_port, run_listener, validate_redirect_uri
+from agentforge_cli.oauth import (
+    OAuthRedirectServer,
+    find_open_port,
+    find_open_socket,
+    run_listener,
+    validate_redirect_uri,
+)
 
 
 def test_validate_redirect_uri_accepts_localhost() -> None:
@@ -54,3 +61,50 @@ def test_oauth_listener_rejects_bad_state() -> None:
     thread.start()
     with pytest.raises(ValueError):
         run_listener(server, timeout=5)
+
+
+def test_oauth_listener_adopts_bound_socket() -> None:
+    sock = find_open_socket()
+    port = sock.getsockname()[1]
+    server = OAuthRedirectServer.from_socket(sock, "state-456", ["/callback"])
+    assert server.socket is sock
+    assert server.server_port == port
+
+    def trigger_request() -> None:
+        time.sleep(0.2)
+        requests.get(
+            f"http://127.0.0.1:{port}/callback",
+            params={"code": "def", "state": "state-456"},
+            timeout=5,
+        )
+
+    thread = threading.Thread(target=trigger_request, daemon=True)
+    thread.start()
+    params = run_listener(server, timeout=5)
+    assert params["code"] == "def"
+
+
+def test_oauth_listener_times_out() -> None:
+    server = OAuthRedirectServer.from_socket(find_open_socket(), "state", ["/callback"])
+    with pytest.raises(TimeoutError):
+        run_listener(server, timeout=0.2)
+
+
+def test_oauth_listener_rejects_socket_on_other_port() -> None:
+    sock = find_open_socket()
+    port = sock.getsockname()[1]
+    with pytest.raises(ValueError):
+        OAuthRedirectServer(port + 1, "state", ["/callback"], sock=sock)
+    sock.close()
+
+
+def test_oauth_listener_times_out_with_silent_client() -> None:
+    server = OAuthRedirectServer.from_socket(find_open_socket(), "state", ["/callback"])
+    client = socket.create_connection(("127.0.0.1", server.server_port))
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            run_listener(server, timeout=0.5)
+        assert time.monotonic() - started < 3
+    finally:
+        client.close()
@@ -148,3 +148,59 @@ def test_filter_commands_case_insensitive():
     # Mixed case
     filtered = filter_commands("AuTh", commands)
     assert len(filtered) == 1
+
+
+def test_build_command_catalog_is_cached():
+    """Test that the catalog is built once per group."""
+
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command()
+    def deploy():
+        """Deploy Things"""
+        pass
+
+    catalog = build_command_catalog(cli)
+
+    assert build_command_catalog(cli) is catalog
+    assert catalog[0]["help_lower"] == "deploy things"
+
+
+def test_filter_commands_uses_trigram_index():
+    """Test that catalog filtering matches a plain substring scan."""
+
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command()
+    def deploy():
+        """Ship the build"""
+        pass
+
+    @cli.command()
+    def status():
+        """Show queue status"""
+        pass
+
+    @cli.command()
+    def shipment():
+        """Track packages"""
+        pass
+
+    catalog = build_command_catalog(cli)
+
+    for query in ("ship", "SHIP", "st", "queue", "missing", "atus"):
+        expected = filter_commands(query, list(catalog))
+        assert filter_commands(query, catalog) == expected
+    assert [cmd["name"] for cmd in filter_commands("ship", catalog)] == ["deploy", "shipment"]
+
+
+def test_highlight_matches_with_precomputed_lowercase():
+    """Test highlighting with caller-supplied lowercase strings."""
+    text = "Run The Queue"
+
+    highlighted = highlight_matches("queue", text, query_lower="queue", text_lower=text.lower())
+    assert highlighted == "Run The [Queue]"
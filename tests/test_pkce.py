@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from agentforge_cli.oauth.pkce import generate_code_challenge, generate_code_verifier
+
+
+def test_code_challenge_matches_rfc7636_example() -> None:
+    verifier = "dBjftJeZ4CVP-mB92K27uhbUJU1p1r_wW1gFWFOEjXk"
+    expected = "E9Melhoa2OwvFrEMTJguCHaoeK1t8URWbuGJSstw-cM"
+    assert generate_code_challenge(verifier) == expected
+    assert generate_code_challenge(verifier.encode("ascii")) == expected
+
+
+def test_code_verifier_length_and_alphabet() -> None:
+    for length in (43, 64, 128):
+        verifier = generate_code_verifier(length)
+        assert len(verifier) == length
+        assert re.fullmatch(r"[A-Za-z0-9_-]+", verifier)
+    with pytest.raises(ValueError):
+        generate_code_verifier(42)
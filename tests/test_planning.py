@@ -87,6 +87,34 @@ def test_order_by_dependencies():
     assert ordered[2]["id"] == "TODO-003"
 
 
+def test_order_by_dependencies_prefers_priority_among_ready():
+    """Test that ready TODOs come out by priority, ties in readiness order."""
+    todos = [
+        {"id": "TODO-001", "dependencies": [], "priority": 5},
+        {"id": "TODO-002", "dependencies": [], "priority": 1},
+        {"id": "TODO-003", "dependencies": ["TODO-002"], "priority": 5},
+        {"id": "TODO-004", "dependencies": [], "priority": 9},
+    ]
+
+    ordered = order_by_dependencies(todos)
+
+    assert [todo["id"] for todo in ordered] == ["TODO-002", "TODO-001", "TODO-003", "TODO-004"]
+
+
+def test_independent_todos_order_by_priority_and_share_level_zero():
+    """Test the no-dependency fast path keeps priority order and input order for ties."""
+    todos = [
+        {"id": "TODO-001", "dependencies": [], "priority": 5},
+        {"id": "TODO-002", "priority": 1},
+        {"id": "TODO-003", "dependencies": [], "priority": 5},
+    ]
+
+    ordered = order_by_dependencies(todos)
+
+    assert [todo["id"] for todo in ordered] == ["TODO-002", "TODO-001", "TODO-003"]
+    assert assign_levels(todos) == {"TODO-001": 0, "TODO-002": 0, "TODO-003": 0}
+
+
 def test_detect_cycles_no_cycle():
     """Test cycle detection with no cycles."""
     todos = [
@@ -112,6 +140,29 @@ def test_detect_cycles_with_cycle():
     assert len(cycle) > 0
 
 
+def test_detect_cycles_returns_cycle_path():
+    """Test that the reported cycle follows dependency edges from its entry."""
+    todos = [
+        {"id": "TODO-001", "dependencies": ["TODO-003"]},
+        {"id": "TODO-002", "dependencies": ["TODO-001"]},
+        {"id": "TODO-003", "dependencies": ["TODO-002"]},
+    ]
+
+    assert detect_cycles(todos) == ["TODO-001", "TODO-003", "TODO-002"]
+
+
+def test_deep_dependency_chain_does_not_recurse():
+    """Test that long chains stay within the interpreter's recursion limit."""
+    depth = 5000
+    todos = [
+        {"id": f"TODO-{idx:05d}", "dependencies": [f"TODO-{idx - 1:05d}"] if idx else []}
+        for idx in range(depth)
+    ]
+
+    assert detect_cycles(todos) is None
+    assert assign_levels(list(reversed(todos)))[f"TODO-{depth - 1:05d}"] == depth - 1
+
+
 def test_assign_levels():
     """Test level assignment."""
     todos = [
@@ -127,6 +178,21 @@ def test_assign_levels():
     assert levels["TODO-003"] == 2
 
 
+def test_assign_levels_reuses_results_for_same_structure():
+    """Test that cached levels follow structure and are safe to mutate."""
+    todos = [
+        {"id": "TODO-001", "dependencies": []},
+        {"id": "TODO-002", "dependencies": ["TODO-001"]},
+    ]
+
+    first = assign_levels(todos)
+    first["TODO-002"] = 99
+    assert assign_levels([dict(todo) for todo in todos]) == {"TODO-001": 0, "TODO-002": 1}
+
+    todos[1]["dependencies"] = []
+    assert assign_levels(todos)["TODO-002"] == 0
+
+
 def test_format_plan_markdown():
     """Test plan markdown generation."""
     todos = [
@@ -159,6 +225,21 @@ def test_format_plan_markdown():
     assert "Phase 1" in markdown
 
 
+def test_format_plan_markdown_orders_levels_by_priority():
+    """Test TODOs are grouped by level and priority-ordered inside a level."""
+    todos = [
+        {"id": "TODO-001", "title": "Base", "dependencies": [], "priority": 1},
+        {"id": "TODO-002", "title": "Later", "dependencies": ["TODO-001"], "priority": 7},
+        {"id": "TODO-003", "title": "Sooner", "dependencies": ["TODO-001"], "priority": 2},
+    ]
+
+    markdown = format_plan_markdown("Test", "1.0", [], todos)
+    order = markdown.split("## Dependency Order")[1]
+
+    assert order.index("### Level 0") < order.index("TODO-001") < order.index("### Level 1")
+    assert order.index("TODO-003") < order.index("TODO-002")
+
+
 def test_format_todos_yaml():
     """Test YAML formatting."""
     todos = [
@@ -194,6 +275,32 @@ def test_format_todos_yaml():
     assert len(data["todos"]) == 1
 
 
+def test_format_todos_yaml_totals_effort():
+    """Test effort parsing and label counts in the YAML summary."""
+    efforts = ["1.5 hours", "30 minutes", "a few hours", "2hours", "soon"]
+    todos = [
+        {"id": f"TODO-{idx:03d}", "label": label, "estimated_effort": effort}
+        for idx, (label, effort) in enumerate(zip(["core", "core", "support", "verify", "verify"], efforts))
+    ]
+
+    summary = yaml.safe_load(format_todos_yaml(todos, "Test", "1.0"))["summary"]
+
+    # 1.5 + 0.5 + 1 (unreadable) + 1 (unreadable) + 0 (no unit)
+    assert summary["estimated_total_effort"] == "4.0 hours"
+    assert (summary["core_todos"], summary["support_todos"], summary["verify_todos"]) == (2, 1, 2)
+
+
+def test_format_outputs_share_generated_date():
+    """Test an explicit generation date reaches both outputs."""
+    todos = [{"id": "TODO-001", "title": "Write docs", "label": "support", "dependencies": []}]
+
+    markdown = format_plan_markdown("Test", "1.0", [], todos, generated="2024-05-01")
+    data = yaml.safe_load(format_todos_yaml(todos, "Test", "1.0", generated="2024-05-01"))
+
+    assert "**Generated:** 2024-05-01" in markdown
+    assert data["generated"] == "2024-05-01"
+
+
 def test_generate_plan():
     """Test complete plan generation."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -23,3 +23,12 @@ def test_prompt_preview_cli(tmp_path, monkeypatch) -> None:
     assert result.exit_code == 0
     assert "write docs" in result.output.lower()
     assert "memory line" in result.output
+
+
+def test_append_rule_updates_cached_rules(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("AGENTFORGE_HOME", str(tmp_path / "home"))
+    manager = SystemPromptManager()
+    manager.append_rule("Cite the files you touched.")
+    rendered = manager.render("Write docs")
+    assert "- Cite the files you touched." in rendered.system_prompt
+    assert rendered.rules[-1] == "Cite the files you touched."
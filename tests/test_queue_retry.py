@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from agentforge_cli.queue import TaskStore
+from agentforge_cli.queue import CLAIM_TASK_SQL, HAS_PENDING_SQL, PENDING_COUNT_SQL, TASK_STATS_SQL, TaskStore
 
 
 @pytest.fixture
@@ -49,3 +51,161 @@ def test_fail_after_max_attempts(store: TaskStore) -> None:
     stats = store.stats()
     assert stats["failed"] == 1
     assert stats["pending"] == 0
+
+
+def test_bulk_enqueue(store: TaskStore) -> None:
+    added = store.add_tasks(f"bulk {idx}" for idx in range(5))
+    assert added == 5
+    assert store.add_tasks([]) == 0
+    assert [task.description for task in store.list_tasks()] == [f"bulk {idx}" for idx in range(5)]
+    assert store.stats()["pending"] == 5
+
+
+def test_list_tasks_limit(store: TaskStore) -> None:
+    store.add_tasks(f"bulk {idx}" for idx in range(5))
+    limited = store.list_tasks(limit=2)
+    assert [task.description for task in limited] == ["bulk 0", "bulk 1"]
+    assert isinstance(limited[0].created_at, datetime)
+    assert len(store.list_tasks(limit=0)) == 5
+
+
+def test_task_store_uses_wal(store: TaskStore) -> None:
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_wait_for_task_wakes_on_enqueue(store: TaskStore) -> None:
+    woke = threading.Event()
+
+    def waiter() -> None:
+        store.wait_for_task(timeout=5)
+        woke.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.1)
+    store.add_task("wake up")
+    assert woke.wait(timeout=1)
+    thread.join()
+
+    store.shutdown()
+    started = time.monotonic()
+    store.wait_for_task(timeout=5)
+    assert time.monotonic() - started < 1
+
+    store.resume()
+    assert store.wait_for_shutdown(0.05) is False
+
+
+def test_network_mode_keeps_rollback_journal(tmp_path: Path) -> None:
+    path = tmp_path / "queue.db"
+    TaskStore(path).close()
+    store = TaskStore(path, network_mode=True)
+    try:
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        store.close()
+
+
+def test_stats_queries_read_only_the_covering_index(store: TaskStore) -> None:
+    for sql, params in ((TASK_STATS_SQL, {"now": ""}), (PENDING_COUNT_SQL, ("",))):
+        plan = " ".join(row[3] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        assert "COVERING INDEX idx_tasks_pending" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_stats_counts_each_status(store: TaskStore) -> None:
+    assert store.stats() == {"total": 0, "pending": 0, "delayed": 0, "running": 0, "completed": 0, "failed": 0}
+    store.add_tasks(f"task {idx}" for idx in range(4))
+    store.complete_task(store.claim_task().id, "ok")
+    store.fail_task(store.claim_task(), "boom")
+    store.claim_task()
+    assert store.stats() == {"total": 4, "pending": 1, "delayed": 1, "running": 1, "completed": 1, "failed": 0}
+
+
+def test_claim_walks_the_pending_index_in_order(store: TaskStore) -> None:
+    plan = [row[3] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {CLAIM_TASK_SQL}", {"now": ""})]
+    assert any("idx_tasks_claim" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+    low = store.add_task("low", priority=1)
+    high = store.add_task("high", priority=5)
+    assert [store.claim_task().id, store.claim_task().id] == [high, low]
+
+
+def test_reads_do_not_wait_for_the_writer_lock(store: TaskStore) -> None:
+    store.add_task("queued")
+    with store.lock:
+        assert store.stats()["pending"] == 1
+        assert store.pending_count() == 1
+        assert [task.description for task in store.list_tasks()] == ["queued"]
+    with store._readers.connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM tasks")
+
+
+def test_transaction_groups_writes_into_one_commit(store: TaskStore) -> None:
+    with store.transaction():
+        first = store.add_task("first")
+        store.add_task("second")
+        store.complete_task(first, "done")
+        assert store.stats()["total"] == 0
+    stats = store.stats()
+    assert (stats["total"], stats["completed"]) == (2, 1)
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.add_task("discarded")
+            raise RuntimeError("abort")
+    assert store.stats()["total"] == 2
+    assert not store.conn.in_transaction
+
+
+def test_shutdown_interrupts_work_and_requeues_task(store: TaskStore) -> None:
+    task_id = store.add_task("long running")
+    task = store.claim_task()
+    assert task is not None and task.attempts == 1
+    assert store.wait_for_shutdown(0.01) is False
+
+    store.shutdown()
+    started = time.monotonic()
+    assert store.wait_for_shutdown(5) is True
+    assert time.monotonic() - started < 1
+    store.requeue_task(task_id)
+
+    [requeued] = store.list_tasks()
+    assert requeued.status == "pending"
+    assert requeued.attempts == 0
+
+
+def test_list_tasks_shares_parsed_batch_timestamps(store: TaskStore) -> None:
+    store.add_tasks(["first", "second"])
+    first, second = store.list_tasks()
+    assert first.created_at is second.created_at
+    assert first.available_at == first.created_at
+
+
+def test_claim_task_reuses_known_timestamps(store: TaskStore) -> None:
+    store.add_task("fresh")
+    task = store.claim_task()
+    assert task.available_at is task.created_at
+    assert task.updated_at >= task.created_at
+
+
+def test_task_store_rejects_sqlite_without_returning(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 34, 1))
+    with pytest.raises(RuntimeError, match="3.35.0"):
+        TaskStore(tmp_path / "queue.db")
+    assert not (tmp_path / "queue.db").exists()
+
+
+def test_has_pending_ignores_delayed_and_claimed_tasks(store: TaskStore) -> None:
+    assert store.has_pending() is False
+    store.add_task("later", available_at=datetime.utcnow() + timedelta(hours=1))
+    assert store.has_pending() is False
+    store.add_task("now")
+    assert store.has_pending() is True
+    store.claim_task()
+    assert store.has_pending() is False
+    plan = " ".join(row[3] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {HAS_PENDING_SQL}", ("",)))
+    assert "SCAN tasks" not in plan
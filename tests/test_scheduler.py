@@ -4,9 +4,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
+from croniter import croniter
 
 from agentforge_cli.scheduler import ScheduleSpec, parse_schedule_time
-from agentforge_cli.queue import TaskStore
+from agentforge_cli import queue as queue_module
+from agentforge_cli.queue import TaskStore, _simple_cron_next
 
 
 @pytest.fixture
@@ -63,3 +65,66 @@ def test_cron_reschedules_until_max_runs(store: TaskStore, monkeypatch: pytest.M
     ).fetchone()
     assert row["run_count"] == 2
     assert row["status"] == "completed"
+
+
+def test_release_due_scheduled_honours_limit(store: TaskStore) -> None:
+    due = datetime.utcnow() - timedelta(seconds=5)
+    for idx in range(3):
+        store.add_scheduled_task(f"one-shot {idx}", due + timedelta(seconds=idx))
+
+    assert store.release_due_scheduled(limit=2) == 2
+    statuses = [row["status"] for row in store.conn.execute("SELECT status FROM scheduled_tasks ORDER BY id")]
+    assert statuses == ["released", "released", "pending"]
+    descriptions = [task.description for task in store.list_tasks()]
+    assert descriptions == ["one-shot 0", "one-shot 1"]
+
+    assert store.release_due_scheduled() == 1
+    assert store.stats()["pending"] == 3
+
+
+def test_release_due_scheduled_rolls_back_on_error(store: TaskStore) -> None:
+    due = datetime.utcnow() - timedelta(seconds=5)
+    store.add_scheduled_task("one-shot", due)
+    store.add_scheduled_task("broken cron", due + timedelta(seconds=1), cron_expression="not a cron")
+
+    with pytest.raises(Exception):
+        store.release_due_scheduled()
+
+    assert not store.conn.in_transaction
+    assert store.list_tasks() == []
+    statuses = [row["status"] for row in store.conn.execute("SELECT status FROM scheduled_tasks ORDER BY id")]
+    assert statuses == ["pending", "pending"]
+
+
+def test_shared_cron_expression_reschedules_from_each_base(store: TaskStore) -> None:
+    first = datetime(2026, 1, 1, 8, 15)
+    second = datetime(2026, 1, 1, 11, 40)
+    for base in (first, second):
+        store.add_scheduled_task(f"hourly from {base:%H:%M}", base, cron_expression="0 8-18 * * *")
+
+    assert store.release_due_scheduled() == 2
+    next_runs = [row["scheduled_for"] for row in store.conn.execute("SELECT scheduled_for FROM scheduled_tasks ORDER BY id")]
+    assert next_runs == ["2026-01-01T09:00:00", "2026-01-01T12:00:00"]
+    assert list(store._cron_iterators) == ["0 8-18 * * *"]
+
+
+@pytest.mark.parametrize("expression", ["* * * * *", "*/7 * * * *", "*/15 * * * *", "30 * * * *", "45 23 * * *", "@hourly", "@daily"])
+@pytest.mark.parametrize(
+    "base",
+    [datetime(2026, 1, 1, 12, 30), datetime(2026, 1, 1, 12, 56, 10), datetime(2026, 12, 31, 23, 59, 59, 500)],
+)
+def test_simple_cron_next_matches_croniter(expression: str, base: datetime) -> None:
+    assert _simple_cron_next(expression, base) == croniter(expression, base).get_next(datetime)
+
+
+@pytest.mark.parametrize("expression", ["5/10 * * * *", "* 3 * * *", "*/0 * * * *", "0 0 1 * *", "0 9 * * 1-5"])
+def test_simple_cron_next_defers_other_expressions(expression: str) -> None:
+    assert _simple_cron_next(expression, datetime(2026, 1, 1)) is None
+
+
+def test_cron_iterator_cache_is_bounded(store: TaskStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(queue_module, "_CRON_CACHE_SIZE", 2)
+    base = datetime(2026, 1, 1, 8, 15)
+    for hours in ("8-18", "9-17", "8-18", "10-16"):
+        store._next_cron_time(f"0 {hours} * * *", base)
+    assert list(store._cron_iterators) == ["0 8-18 * * *", "0 10-16 * * *"]